@@ -1,13 +1,15 @@
 """AI Long Term Memory component."""
 import logging
+from functools import partial
+from typing import Optional
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, ServiceCall, SupportsResponse
 
-from . import memory_llm_api
-from .constants import DOMAIN, ENGINE_TFIDF, MEMORY_MAX_ENTRIES
+from .constants import DOMAIN, ENGINE_TFIDF, MEMORY_MAX_ENTRIES, SCOPES
+from .llm import api as llm_api
 from .memory.manager import MemoryManager
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,7 +29,7 @@ LIST_MEMORIES_SCHEMA = vol.Schema({
     vol.Optional("limit", default=50): int,
     vol.Optional("room"): str,
     vol.Optional("wing"): str,
-    vol.Optional("scope"): vol.In(["private", "common"]),
+    vol.Optional("scope"): vol.In(SCOPES),
     vol.Optional("agent_id"): str,
 })
 
@@ -43,7 +45,7 @@ SEARCH_MEMORY_SCHEMA = vol.Schema({
 DELETE_MEMORY_SCHEMA = vol.Schema({
     vol.Optional("room"): str,
     vol.Optional("wing"): str,
-    vol.Optional("scope"): vol.In(["private", "common"]),
+    vol.Optional("scope"): vol.In(SCOPES),
     vol.Optional("agent_id"): str,
 })
 
@@ -51,15 +53,20 @@ DELETE_MEMORY_SCHEMA = vol.Schema({
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the AI Memory component."""
     hass.data.setdefault(DOMAIN, {})
+
+    # Services live for the lifetime of the integration, not of an entry;
+    # handlers resolve the manager at call time.
+    if not hass.services.has_service(DOMAIN, SERVICE_ADD_MEMORY):
+        _register_services(hass)
+
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up AI Memory from a config entry."""
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
+    domain_data = hass.data.setdefault(DOMAIN, {})
 
-    if "manager" in hass.data[DOMAIN]:
+    if "manager" in domain_data:
         _LOGGER.debug("AI Memory already initialized")
         await hass.config_entries.async_forward_entry_setups(entry, [Platform.SENSOR])
         return True
@@ -68,119 +75,137 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     engine_type = entry.data.get("embedding_engine", ENGINE_TFIDF)
     max_entries = entry.data.get("max_entries", MEMORY_MAX_ENTRIES)
 
-    manager = MemoryManager(hass, engine_type, max_entries, config_data=entry.data)
+    # Construction opens SQLite and runs migrations, so keep it off the event loop
+    manager = await hass.async_add_executor_job(
+        partial(MemoryManager, hass, engine_type, max_entries, config_data=entry.data)
+    )
 
     # Initialize embedding engine
     await manager.async_initialize()
 
-    hass.data[DOMAIN]["manager"] = manager
+    domain_data["manager"] = manager
     _LOGGER.debug("Initialized Single Memory Manager")
 
+    # Config entries are not unloaded on shutdown, so save pending state here
+    async def _async_flush_on_stop(_event: Event):
+        manager.async_cancel_scheduled_flush()
+        await hass.async_add_executor_job(manager.flush)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
+
     # Initialize LLM API
-    await memory_llm_api.async_setup(hass)
+    await llm_api.async_setup(hass)
     _LOGGER.debug("Initialized Memory LLM API")
 
     # Forward setup
     await hass.config_entries.async_forward_entry_setups(entry, [Platform.SENSOR])
 
-    # Register services
-    _register_services(hass)
-
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
 
+def _get_manager(hass: HomeAssistant) -> Optional[MemoryManager]:
+    """Return the active memory manager, if the integration is set up."""
+    domain_data = hass.data.get(DOMAIN)
+    return domain_data.get("manager") if domain_data else None
+
+
+async def _async_handle_add_memory(call: ServiceCall):
+    """Handle add_memory service call."""
+    manager = _get_manager(call.hass)
+    if not manager:
+        _LOGGER.error("Memory manager not initialized")
+        return {"error": "Memory manager not initialized"}
+
+    text = call.data.get("text", "")
+    room = call.data.get("room")
+    wing = call.data.get("wing")
+    await manager.async_add_memory(text, "common", room=room, wing=wing)
+    return {"success": True}
+
+
+async def _async_handle_list_memories(call: ServiceCall):
+    """Handle list_memories service call."""
+    manager = _get_manager(call.hass)
+    if not manager:
+        _LOGGER.error("Memory manager not initialized")
+        return {"error": "Memory manager not initialized"}
+
+    limit = call.data.get("limit", 50)
+    room = call.data.get("room")
+    wing = call.data.get("wing")
+    scope = call.data.get("scope")
+    agent_id = call.data.get("agent_id")
+
+    memories = await manager.async_get_memories(
+        limit=limit,
+        room=room,
+        wing=wing,
+        scope=scope,
+        agent_id=agent_id,
+    )
+    return {"memories": memories, "count": len(memories)}
+
+
+async def _async_handle_search_memory(call: ServiceCall):
+    """Handle search_memory service call."""
+    manager = _get_manager(call.hass)
+    if not manager:
+        _LOGGER.error("Memory manager not initialized")
+        return {"error": "Memory manager not initialized"}
+
+    query = call.data.get("query")
+    limit = call.data.get("limit", 5)
+    min_score = call.data.get("min_score", 0.55)
+    room = call.data.get("room")
+    wing = call.data.get("wing")
+    agent_id = call.data.get("agent_id")
+
+    results = await manager.async_search_memory(
+        query=query,
+        agent_id=agent_id,
+        limit=limit,
+        min_score=min_score,
+        wing=wing,
+        room=room,
+    )
+    return {"results": results, "count": len(results)}
+
+
+async def _async_handle_delete_memory(call: ServiceCall):
+    """Handle delete_memory service call."""
+    manager = _get_manager(call.hass)
+    if not manager:
+        _LOGGER.error("Memory manager not initialized")
+        return {"error": "Memory manager not initialized"}
+
+    room = call.data.get("room")
+    wing = call.data.get("wing")
+    scope = call.data.get("scope")
+    agent_id = call.data.get("agent_id")
+
+    count = await manager.async_delete_memory(
+        agent_id=agent_id,
+        room=room,
+        wing=wing,
+        scope=scope,
+    )
+    _LOGGER.info("Deleted %d memory(s)", count)
+    return {"deleted_count": count}
+
+
 def _register_services(hass: HomeAssistant):
     """Register HA services for AI Memory."""
-
-    async def handle_add_memory(call: ServiceCall):
-        """Handle add_memory service call."""
-        manager = hass.data.get(DOMAIN, {}).get("manager")
-        if not manager:
-            _LOGGER.error("Memory manager not initialized")
-            return {"error": "Memory manager not initialized"}
-
-        text = call.data.get("text", "")
-        room = call.data.get("room")
-        wing = call.data.get("wing")
-        await manager.async_add_memory(text, "common", room=room, wing=wing)
-        return {"success": True}
-
-    async def handle_list_memories(call: ServiceCall):
-        """Handle list_memories service call."""
-        manager = hass.data.get(DOMAIN, {}).get("manager")
-        if not manager:
-            _LOGGER.error("Memory manager not initialized")
-            return {"error": "Memory manager not initialized"}
-
-        limit = call.data.get("limit", 50)
-        room = call.data.get("room")
-        wing = call.data.get("wing")
-        scope = call.data.get("scope")
-        agent_id = call.data.get("agent_id")
-
-        memories = await manager.async_get_memories(
-            limit=limit,
-            room=room,
-            wing=wing,
-            scope=scope,
-            agent_id=agent_id,
-        )
-        return {"memories": memories, "count": len(memories)}
-
-    async def handle_search_memory(call: ServiceCall):
-        """Handle search_memory service call."""
-        manager = hass.data.get(DOMAIN, {}).get("manager")
-        if not manager:
-            _LOGGER.error("Memory manager not initialized")
-            return {"error": "Memory manager not initialized"}
-
-        query = call.data.get("query")
-        limit = call.data.get("limit", 5)
-        min_score = call.data.get("min_score", 0.55)
-        room = call.data.get("room")
-        wing = call.data.get("wing")
-        agent_id = call.data.get("agent_id")
-
-        results = await manager.async_search_memory(
-            query=query,
-            agent_id=agent_id,
-            limit=limit,
-            min_score=min_score,
-            wing=wing,
-            room=room,
-        )
-        return {"results": results, "count": len(results)}
-
-    async def handle_delete_memory(call: ServiceCall):
-        """Handle delete_memory service call."""
-        manager = hass.data.get(DOMAIN, {}).get("manager")
-        if not manager:
-            _LOGGER.error("Memory manager not initialized")
-            return {"error": "Memory manager not initialized"}
-
-        room = call.data.get("room")
-        wing = call.data.get("wing")
-        scope = call.data.get("scope")
-        agent_id = call.data.get("agent_id")
-
-        count = await manager.async_delete_memory(
-            agent_id=agent_id,
-            room=room,
-            wing=wing,
-            scope=scope,
-        )
-        _LOGGER.info("Deleted %d memory(s)", count)
-        return {"deleted_count": count}
-
-    hass.services.async_register(DOMAIN, SERVICE_ADD_MEMORY, handle_add_memory, schema=ADD_MEMORY_SCHEMA,
-                                 supports_response=SupportsResponse.OPTIONAL)
-    hass.services.async_register(DOMAIN, SERVICE_LIST_MEMORIES, handle_list_memories, schema=LIST_MEMORIES_SCHEMA,
-                                 supports_response=SupportsResponse.OPTIONAL)
-    hass.services.async_register(DOMAIN, SERVICE_SEARCH_MEMORY, handle_search_memory, schema=SEARCH_MEMORY_SCHEMA,
-                                 supports_response=SupportsResponse.OPTIONAL)
-    hass.services.async_register(DOMAIN, SERVICE_DELETE_MEMORY, handle_delete_memory, schema=DELETE_MEMORY_SCHEMA,
+    hass.services.async_register(DOMAIN, SERVICE_ADD_MEMORY, _async_handle_add_memory, schema=ADD_MEMORY_SCHEMA,
                                  supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_LIST_MEMORIES, _async_handle_list_memories,
+                                 schema=LIST_MEMORIES_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_SEARCH_MEMORY, _async_handle_search_memory,
+                                 schema=SEARCH_MEMORY_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_DELETE_MEMORY, _async_handle_delete_memory,
+                                 schema=DELETE_MEMORY_SCHEMA, supports_response=SupportsResponse.OPTIONAL)
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -195,10 +220,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         manager = hass.data[DOMAIN].pop("manager", None)
         if manager:
-            manager.close()
-
-        # Remove services
-        for service in [SERVICE_ADD_MEMORY, SERVICE_LIST_MEMORIES, SERVICE_SEARCH_MEMORY, SERVICE_DELETE_MEMORY]:
-            hass.services.async_remove(DOMAIN, service)
+            manager.async_cancel_scheduled_flush()
+            await hass.async_add_executor_job(manager.close)
 
     return unload_ok
@@ -1,15 +1,17 @@
 """Config flow for AI Memory integration."""
+import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from . import MEMORY_MAX_ENTRIES
 from .constants import (
     DOMAIN,
     DEFAULT_MODEL,
@@ -17,7 +19,9 @@ from .constants import (
     ENGINE_REMOTE,
     ENGINE_TFIDF,
     ENGINE_NAMES,
+    MEMORY_MAX_ENTRIES,
 )
+from .utils import json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,11 +31,142 @@ CONF_MODEL_NAME = "model_name"
 CONF_IDENTITY_TEXT = "identity_text"
 
 
+# Model listings are reused across flow steps and re-entries for this long
+MODELS_CACHE_TTL = 60
+
+_ENGINE_VALIDATOR = vol.In(ENGINE_NAMES)
+_MAX_ENTRIES_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=10000))
+
+# Static step schemas, built once at import
+_USER_SCHEMA = vol.Schema({
+    vol.Optional(
+        "max_entries",
+        default=MEMORY_MAX_ENTRIES
+    ): _MAX_ENTRIES_VALIDATOR,
+    vol.Optional(
+        "embedding_engine",
+        default=ENGINE_REMOTE
+    ): _ENGINE_VALIDATOR,
+})
+
+_REMOTE_CONFIG_SCHEMA = vol.Schema({
+    vol.Required(
+        CONF_REMOTE_URL,
+        default=DEFAULT_REMOTE_URL
+    ): str,
+})
+
+_PALACE_CONFIG_SCHEMA = vol.Schema({
+    vol.Optional(
+        CONF_IDENTITY_TEXT,
+        default="",
+    ): str,
+})
+
+# A mistyped URL should fail fast on connect, well inside the total budget
+_TAGS_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2)
+# Pulls can legitimately take minutes, but an unreachable server should fail fast
+_PULL_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=5, sock_read=30)
+
+
 def _validate_url(url: str) -> bool:
     """Basic URL format validation."""
     return url.startswith("http://") or url.startswith("https://")
 
 
+async def _async_fetch_models(hass: HomeAssistant, remote_url: str) -> List[str]:
+    """Fetch model names from the remote /api/tags endpoint.
+
+    Successful listings are cached per URL for MODELS_CACHE_TTL seconds.
+    Connection errors and non-200 responses propagate to the caller as
+    aiohttp.ClientError.
+    """
+    cache = hass.data.setdefault(DOMAIN, {}).setdefault("models_cache", {})
+    cached = cache.get(remote_url)
+    if cached and time.monotonic() - cached[0] < MODELS_CACHE_TTL:
+        return cached[1]
+
+    session = async_get_clientsession(hass)
+    async with session.get(
+        f"{remote_url}/api/tags",
+        timeout=_TAGS_TIMEOUT,
+    ) as response:
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info, response.history, status=response.status
+            )
+        data = await response.json(loads=json_loads)
+
+    # Malformed listings surface as ValueError, like an unparsable body
+    entries = data.get("models", []) if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"Unexpected /api/tags response from {remote_url}")
+    models = [m["name"] for m in entries if isinstance(m, dict) and "name" in m]
+    cache[remote_url] = (time.monotonic(), models)
+    return models
+
+
+async def _async_pull_model(hass: HomeAssistant, remote_url: str, model_name: str) -> bool:
+    """Ask the remote server to pull a model.
+
+    Returns True if the server accepted the pull. Connection errors and
+    timeouts propagate to the caller. Concurrent requests for the same
+    model on the same server share one pull.
+    """
+    pulls = hass.data.setdefault(DOMAIN, {}).setdefault("model_pulls", {})
+    key = (remote_url, model_name)
+    task = pulls.get(key)
+    if task is None:
+        # A pull can run for minutes; keep it out of the tracked setup tasks
+        task = hass.async_create_background_task(
+            _async_request_pull(hass, remote_url, model_name),
+            "ai_memory_model_pull",
+        )
+        pulls[key] = task
+        task.add_done_callback(lambda _: pulls.pop(key, None))
+
+    # Shield so one caller going away does not cancel the pull for the others
+    return await asyncio.shield(task)
+
+
+async def _async_request_pull(hass: HomeAssistant, remote_url: str, model_name: str) -> bool:
+    """POST /api/pull and report whether the server accepted it."""
+    session = async_get_clientsession(hass)
+    async with session.post(
+            f"{remote_url}/api/pull",
+            json={"name": model_name},
+            timeout=_PULL_TIMEOUT,
+    ) as response:
+        return response.status == 200
+
+
+async def _async_prefetch_models(hass: HomeAssistant, remote_url: str) -> None:
+    """Warm the model cache while the user is still on the URL form."""
+    try:
+        await _async_fetch_models(hass, remote_url)
+    except Exception as err:
+        _LOGGER.debug("Model prefetch from %s failed: %s", remote_url, err)
+
+
+async def _async_verify_remote(
+        hass: HomeAssistant, remote_url: str, prefetch: Optional[tuple]
+) -> bool:
+    """Check the remote server answers /api/tags before leaving the URL step.
+
+    The listing lands in the models cache, so the model step reuses it
+    instead of fetching again.
+    """
+    if prefetch and prefetch[0] == remote_url:
+        await prefetch[1]
+
+    try:
+        await _async_fetch_models(hass, remote_url)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+        _LOGGER.debug("Remote server %s is not reachable: %s", remote_url, err)
+        return False
+    return True
+
+
 class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for AI Memory."""
 
@@ -41,6 +176,14 @@ class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize config flow."""
         self._default_max_entries = MEMORY_MAX_ENTRIES
         self._user_input = {}
+        self._models_prefetch: Optional[tuple] = None  # (remote_url, task)
+        self._models: Optional[tuple] = None  # (remote_url, models) last rendered
+
+    @callback
+    def async_remove(self) -> None:
+        """Cancel a model prefetch still running when the flow goes away."""
+        if self._models_prefetch is not None:
+            self._models_prefetch[1].cancel()
 
     async def async_step_user(
             self, user_input: Optional[Dict[str, Any]] = None
@@ -60,20 +203,9 @@ class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # TF-IDF: go to palace config
             return await self.async_step_palace_config()
 
-        schema = vol.Schema({
-            vol.Optional(
-                "max_entries",
-                default=self._default_max_entries
-            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
-            vol.Optional(
-                "embedding_engine",
-                default=ENGINE_REMOTE
-            ): vol.In(ENGINE_NAMES),
-        })
-
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
+            data_schema=_USER_SCHEMA,
             errors=errors
         )
 
@@ -87,20 +219,21 @@ class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             remote_url = user_input[CONF_REMOTE_URL]
             if not _validate_url(remote_url):
                 errors["base"] = "invalid_url"
+            elif not await _async_verify_remote(self.hass, remote_url, self._models_prefetch):
+                errors["base"] = "cannot_connect"
             else:
                 self._user_input[CONF_REMOTE_URL] = remote_url
                 return await self.async_step_model_selection()
 
-        schema = vol.Schema({
-            vol.Required(
-                CONF_REMOTE_URL,
-                default=DEFAULT_REMOTE_URL
-            ): str,
-        })
+        if self._models_prefetch is None:
+            self._models_prefetch = (
+                DEFAULT_REMOTE_URL,
+                self.hass.async_create_task(_async_prefetch_models(self.hass, DEFAULT_REMOTE_URL)),
+            )
 
         return self.async_show_form(
             step_id="remote_config",
-            data_schema=schema,
+            data_schema=_REMOTE_CONFIG_SCHEMA,
             errors=errors
         )
 
@@ -116,33 +249,32 @@ class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             # Trigger model download with timeout
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                            f"{remote_url}/api/pull",
-                            json={"name": model_name},
-                            timeout=aiohttp.ClientTimeout(total=300),
-                    ) as response:
-                        if response.status != 200:
-                            errors["base"] = "pull_failed"
-                        else:
-                            self._user_input[CONF_MODEL_NAME] = model_name
-                            return await self.async_step_palace_config()
-            except Exception:
+                pulled = await _async_pull_model(self.hass, remote_url, model_name)
+            except asyncio.TimeoutError:
+                errors["base"] = "timeout"
+            except aiohttp.ClientError:
                 errors["base"] = "cannot_connect"
+            else:
+                if pulled:
+                    self._user_input[CONF_MODEL_NAME] = model_name
+                    return await self.async_step_palace_config()
+                errors["base"] = "pull_failed"
+
+        if user_input is not None and self._models and self._models[0] == remote_url:
+            # Re-render after a failed pull with the list the user picked from
+            models = self._models[1]
+        else:
+            # Fetch models
+            models = [DEFAULT_MODEL]
+            # Let a prefetch for the same server land in the cache first
+            if self._models_prefetch and self._models_prefetch[0] == remote_url:
+                await self._models_prefetch[1]
 
-        # Fetch models
-        models = [DEFAULT_MODEL]
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{remote_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models = [m["name"] for m in data.get("models", [])]
-        except Exception:
-            errors["base"] = "cannot_connect"
+            try:
+                models = await _async_fetch_models(self.hass, remote_url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                errors["base"] = "cannot_connect"
+            self._models = (remote_url, models)
 
         schema = vol.Schema({
             vol.Required(
@@ -176,16 +308,9 @@ class AiMemoryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             return self.async_create_entry(title="AI Memory", data=data)
 
-        schema = vol.Schema({
-            vol.Optional(
-                CONF_IDENTITY_TEXT,
-                default="",
-            ): str,
-        })
-
         return self.async_show_form(
             step_id="palace_config",
-            data_schema=schema,
+            data_schema=_PALACE_CONFIG_SCHEMA,
             description_placeholders={
                 "wing_info": "Household (devices, maintenance, events), Personal (preferences, health, secrets), Automation (routines, schedules), General"
             },
@@ -206,6 +331,14 @@ class AiMemoryOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry):
         """Initialize options flow."""
         self._user_input = {}
+        self._models_prefetch: Optional[tuple] = None  # (remote_url, task)
+        self._models: Optional[tuple] = None  # (remote_url, models) last rendered
+
+    @callback
+    def async_remove(self) -> None:
+        """Cancel a model prefetch still running when the flow goes away."""
+        if self._models_prefetch is not None:
+            self._models_prefetch[1].cancel()
 
     async def async_step_init(
             self, user_input: Optional[Dict[str, Any]] = None
@@ -221,13 +354,11 @@ class AiMemoryOptionsFlow(config_entries.OptionsFlow):
             # Update the entry
             data = dict(self.config_entry.data)
             data.update(user_input)
+            # The entry's update listener reloads it to apply changes
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
                 data=data,
             )
-
-            # Reload to apply changes
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
             return self.async_create_entry(title="", data={})
 
         return self.async_show_form(
@@ -236,11 +367,11 @@ class AiMemoryOptionsFlow(config_entries.OptionsFlow):
                 vol.Required(
                     "max_entries",
                     default=self.config_entry.data.get("max_entries", MEMORY_MAX_ENTRIES)
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+                ): _MAX_ENTRIES_VALIDATOR,
                 vol.Optional(
                     "embedding_engine",
                     default=self.config_entry.data.get("embedding_engine", ENGINE_REMOTE)
-                ): vol.In(ENGINE_NAMES),
+                ): _ENGINE_VALIDATOR,
                 vol.Optional(
                     CONF_IDENTITY_TEXT,
                     default=self.config_entry.data.get("identity_text", ""),
@@ -259,14 +390,23 @@ class AiMemoryOptionsFlow(config_entries.OptionsFlow):
             remote_url = user_input[CONF_REMOTE_URL]
             if not _validate_url(remote_url):
                 errors["base"] = "invalid_url"
+            elif not await _async_verify_remote(self.hass, remote_url, self._models_prefetch):
+                errors["base"] = "cannot_connect"
             else:
                 self._user_input[CONF_REMOTE_URL] = remote_url
                 return await self.async_step_model_selection()
 
+        default_url = self.config_entry.data.get("remote_url", DEFAULT_REMOTE_URL)
+        if self._models_prefetch is None:
+            self._models_prefetch = (
+                default_url,
+                self.hass.async_create_task(_async_prefetch_models(self.hass, default_url)),
+            )
+
         schema = vol.Schema({
             vol.Required(
                 CONF_REMOTE_URL,
-                default=self.config_entry.data.get("remote_url", DEFAULT_REMOTE_URL)
+                default=default_url
             ): str,
         })
 
@@ -288,48 +428,46 @@ class AiMemoryOptionsFlow(config_entries.OptionsFlow):
 
             # Trigger model download with timeout
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                            f"{remote_url}/api/pull",
-                            json={"name": model_name},
-                            timeout=aiohttp.ClientTimeout(total=300),
-                    ) as response:
-                        if response.status != 200:
-                            errors["base"] = "pull_failed"
-                        else:
-                            data = dict(self.config_entry.data)
-                            data.update({
-                                "max_entries": self._user_input.get("max_entries"),
-                                "embedding_engine": self._user_input.get("embedding_engine"),
-                                "remote_url": remote_url,
-                                "model_name": model_name,
-                                "identity_text": self._user_input.get("identity_text", ""),
-                            })
-
-                            self.hass.config_entries.async_update_entry(
-                                self.config_entry,
-                                data=data,
-                            )
-                            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                            return self.async_create_entry(title="", data={})
-            except Exception:
+                pulled = await _async_pull_model(self.hass, remote_url, model_name)
+            except asyncio.TimeoutError:
+                errors["base"] = "timeout"
+            except aiohttp.ClientError:
                 errors["base"] = "cannot_connect"
+            else:
+                if pulled:
+                    data = dict(self.config_entry.data)
+                    data.update({
+                        "max_entries": self._user_input.get("max_entries"),
+                        "embedding_engine": self._user_input.get("embedding_engine"),
+                        "remote_url": remote_url,
+                        "model_name": model_name,
+                        "identity_text": self._user_input.get("identity_text", ""),
+                    })
+
+                    self.hass.config_entries.async_update_entry(
+                        self.config_entry,
+                        data=data,
+                    )
+                    return self.async_create_entry(title="", data={})
+                errors["base"] = "pull_failed"
 
-        # Fetch models
-        models = [DEFAULT_MODEL]
         current_model = self.config_entry.data.get("model_name", DEFAULT_MODEL)
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{remote_url}/api/tags",
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models = [m["name"] for m in data.get("models", [])]
-        except Exception:
-            errors["base"] = "cannot_connect"
+        if user_input is not None and self._models and self._models[0] == remote_url:
+            # Re-render after a failed pull with the list the user picked from
+            models = self._models[1]
+        else:
+            # Fetch models
+            models = [DEFAULT_MODEL]
+            # Let a prefetch for the same server land in the cache first
+            if self._models_prefetch and self._models_prefetch[0] == remote_url:
+                await self._models_prefetch[1]
+
+            try:
+                models = await _async_fetch_models(self.hass, remote_url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                errors["base"] = "cannot_connect"
+            self._models = (remote_url, models)
 
         default_model = current_model if current_model in models else (models[0] if models else DEFAULT_MODEL)
 
@@ -38,6 +38,7 @@ L1_DEMOTION_DAYS = 90
 # Scope constants
 SCOPE_PRIVATE = "private"
 SCOPE_COMMON = "common"
+SCOPES = (SCOPE_PRIVATE, SCOPE_COMMON)
 
 # Database schema version
-DB_VERSION = 1
+DB_VERSION = 2
@@ -1,8 +1,11 @@
 """Embedding Engine for AI Memory with multiple backend support."""
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_call_later
 
 from ..constants import (
     ENGINE_REMOTE,
@@ -14,6 +17,10 @@ _LOGGER = logging.getLogger(__name__)
 
 _EMBEDDING_CACHE_MAX = 100
 
+# Seconds after a vocabulary update before unsaved engine state is flushed;
+# updates landing in between share the same save
+_VOCAB_SAVE_DELAY = 300
+
 
 class EmbeddingEngine:
     """Engine to generate vector embeddings from text with multiple backends.
@@ -37,7 +44,14 @@ class EmbeddingEngine:
         self._engine = None
         self._engine_name = None
         self._initialized = False
-        self._cache: dict = {}  # text -> embedding (LRU, max 100)
+        # Capability flags of the active engine, computed once per engine
+        self._capabilities_engine = None
+        self._supports_update_vocab = False
+        self._supports_flush = False
+        self._unsub_flush = None
+        self._cache: OrderedDict = OrderedDict()  # text -> embedding (LRU, max 100)
+        # Read on the event loop, written from executor threads
+        self._cache_lock = threading.Lock()
 
     def _create_engine(self, engine_type: str):
         """Create specific engine instance."""
@@ -59,6 +73,31 @@ class EmbeddingEngine:
 
         return None
 
+    def _cache_get(self, text: str) -> Optional[List[float]]:
+        """Return a cached embedding and mark it most recently used."""
+        with self._cache_lock:
+            embedding = self._cache.get(text)
+            if embedding is not None:
+                self._cache.move_to_end(text)
+            return embedding
+
+    def _cache_put(self, text: str, embedding: List[float]):
+        """Cache an embedding, evicting the least recently used entry if full."""
+        with self._cache_lock:
+            self._cache[text] = embedding
+            self._cache.move_to_end(text)
+            while len(self._cache) > _EMBEDDING_CACHE_MAX:
+                self._cache.popitem(last=False)
+
+    def _refresh_capabilities(self):
+        """Recompute capability flags if the active engine changed."""
+        engine = self._engine
+        if engine is self._capabilities_engine:
+            return
+        self._supports_update_vocab = callable(getattr(engine, "update_vocabulary", None))
+        self._supports_flush = callable(getattr(engine, "flush", None))
+        self._capabilities_engine = engine
+
     def _try_initialize_engine(self, engine_type: str) -> bool:
         """Try to initialize a specific engine."""
         _LOGGER.debug("Attempting to initialize engine: %s", engine_type)
@@ -68,11 +107,13 @@ class EmbeddingEngine:
             return False
 
         try:
-            if hasattr(engine, '_load_model'):
-                engine._load_model()
+            load_model = getattr(engine, "_load_model", None)
+            if callable(load_model):
+                load_model()
 
             self._engine = engine
             self._engine_name = engine_type
+            self._refresh_capabilities()
             _LOGGER.info("Embedding engine initialized: %s", engine_type)
             return True
 
@@ -87,6 +128,10 @@ class EmbeddingEngine:
 
         _LOGGER.debug("Initializing embedding engine (requested: %s)", self._engine_type)
 
+        # Vectors from a previous engine are not comparable with the new one
+        with self._cache_lock:
+            self._cache.clear()
+
         success = False
 
         # 1. Try requested engine
@@ -118,18 +163,12 @@ class EmbeddingEngine:
         if not self._engine:
             raise RuntimeError("Embedding engine not initialized")
 
-        # Check cache
-        cache_key = text[:200]  # Truncate key to avoid excessive memory
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cached = self._cache_get(text)
+        if cached is not None:
+            return cached
 
         embedding = self._engine.generate_embedding(text)
-
-        # Store in cache (evict oldest if full)
-        if len(self._cache) >= _EMBEDDING_CACHE_MAX:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-        self._cache[cache_key] = embedding
+        self._cache_put(text, embedding)
 
         return embedding
 
@@ -138,6 +177,12 @@ class EmbeddingEngine:
         if not text:
             return []
 
+        # Serve repeats straight from the cache, without an executor hop
+        if self._initialized:
+            cached = self._cache_get(text)
+            if cached is not None:
+                return cached
+
         return await self.hass.async_add_executor_job(
             self._generate_embedding_sync,
             text
@@ -145,14 +190,30 @@ class EmbeddingEngine:
 
     async def async_update_vocabulary(self, text: str):
         """Update vocabulary for engines that need it."""
-        if not self._initialized:
-            self._initialize_engine()
+        # Engine construction loads vocabulary files, so keep it off the loop
+        await self.async_initialize()
 
-        if hasattr(self._engine, 'update_vocabulary'):
+        self._refresh_capabilities()
+        if self._supports_update_vocab:
             await self.hass.async_add_executor_job(
                 self._engine.update_vocabulary,
                 text
             )
+            if self._supports_flush and self._unsub_flush is None:
+                self._unsub_flush = async_call_later(
+                    self.hass, _VOCAB_SAVE_DELAY, self._async_scheduled_flush
+                )
+
+    async def _async_scheduled_flush(self, _now):
+        """Persist engine state after a batch of vocabulary updates."""
+        self._unsub_flush = None
+        await self.hass.async_add_executor_job(self.flush)
+
+    def async_cancel_scheduled_flush(self):
+        """Cancel a pending scheduled flush (must run on the event loop)."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
 
     async def async_initialize(self):
         """Initialize the engine asynchronously (non-blocking)."""
@@ -161,6 +222,19 @@ class EmbeddingEngine:
 
         await self.hass.async_add_executor_job(self._initialize_engine)
 
+    def flush(self):
+        """Persist unsaved engine state (blocking, run in executor)."""
+        flush = getattr(self._engine, "flush", None)
+        if callable(flush):
+            flush()
+
+    def close(self):
+        """Flush unsaved engine state and release its resources (blocking, run in executor)."""
+        self.flush()
+        close = getattr(self._engine, "close", None)
+        if callable(close):
+            close()
+
     @property
     def engine_name(self) -> Optional[str]:
         """Get the name of the active engine."""
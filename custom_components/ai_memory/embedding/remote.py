@@ -5,8 +5,10 @@ from typing import List, Dict, Any
 import aiohttp
 import requests
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from ..constants import DEFAULT_MODEL, DEFAULT_REMOTE_URL
+from ..utils import json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +22,8 @@ class RemoteEmbeddingEngine:
         self.remote_url = config_data.get("remote_url", DEFAULT_REMOTE_URL)
         self.model_name = config_data.get("model_name", DEFAULT_MODEL)
         self._model_loaded = False
+        # Keep-alive pool for the blocking executor-side requests
+        self._session = requests.Session()
 
     def _load_model(self):
         """Trigger model load on remote server."""
@@ -29,9 +33,9 @@ class RemoteEmbeddingEngine:
         """Check if remote service is available."""
         url = f"{self.remote_url}/api/version"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    return response.status == 200
+            session = async_get_clientsession(self.hass)
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                return response.status == 200
         except Exception:
             return False
 
@@ -39,13 +43,13 @@ class RemoteEmbeddingEngine:
         """Async load model (pull)."""
         url = f"{self.remote_url}/api/pull"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={"name": self.model_name}) as response:
-                    if response.status == 200:
-                        _LOGGER.info("Remote model %s loaded/ready", self.model_name)
-                        self._model_loaded = True
-                    else:
-                        _LOGGER.error("Failed to load remote model: %s", await response.text())
+            session = async_get_clientsession(self.hass)
+            async with session.post(url, json={"name": self.model_name}) as response:
+                if response.status == 200:
+                    _LOGGER.info("Remote model %s loaded/ready", self.model_name)
+                    self._model_loaded = True
+                else:
+                    _LOGGER.error("Failed to load remote model: %s", await response.text())
         except Exception as e:
             _LOGGER.error("Failed to connect to remote service during pull: %s", e)
             self._model_loaded = False
@@ -60,13 +64,13 @@ class RemoteEmbeddingEngine:
         """
         url = f"{self.remote_url}/api/embed"
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json={"model": self.model_name, "input": [text]},
                 timeout=30,
             )
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             embedding = data["embeddings"][0]
             return embedding
         except Exception as e:
@@ -76,3 +80,7 @@ class RemoteEmbeddingEngine:
     def update_vocabulary(self, text: str):
         """No-op for Remote Engine."""
         pass
+
+    def close(self):
+        """Close the pooled HTTP connections (blocking)."""
+        self._session.close()
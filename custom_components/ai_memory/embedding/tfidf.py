@@ -1,19 +1,35 @@
-"""TF-IDF based embedding engine for AI Memory (stdlib only, no dependencies)."""
-import json
+"""TF-IDF based embedding engine for AI Memory (stdlib + NumPy, no ML dependencies)."""
+import heapq
 import logging
 import math
 import os
 import re
+import threading
+import zlib
 from collections import Counter, defaultdict
+from operator import itemgetter
 from typing import List, Dict
 
+import numpy as np
 from homeassistant.core import HomeAssistant
 
+from ..utils import json_dumps, json_loads
+
 _LOGGER = logging.getLogger(__name__)
 
+# Word boundaries around \w+ are implied, so they are left out of the pattern
+_TOKEN_RE = re.compile(r"\w+")
+
+# Vocabulary size that triggers pruning; pruning leaves headroom below it
+_VOCAB_MAX_TERMS = 100000
+_VOCAB_PRUNE_TARGET = 90000
+
+# Bound on memoised term -> index entries before the memo is reset
+_INDEX_CACHE_MAX = 50000
+
 
 class TFIDFEmbeddingEngine:
-    """Lightweight embedding engine using TF-IDF (no external dependencies).
+    """Lightweight embedding engine using TF-IDF (no ML dependencies).
 
     This engine provides semantic search capabilities without requiring
     sentence-transformers or any ML libraries. Perfect for resource-constrained
@@ -34,9 +50,16 @@ class TFIDFEmbeddingEngine:
         self.vector_dim = vector_dim
         self._document_count = 0
         self._term_document_freq: Dict[str, int] = defaultdict(int)
+        # Highest document frequency dropped by pruning; unknown terms score as this
+        self._df_floor = 0
         self._vocabulary_file = os.path.join(
             hass.config.path(), ".storage", "ai_memory_tfidf_vocab.json"
         )
+        self._storage_dir_ready = False
+        self._index_cache: Dict[str, int] = {}
+        self._dirty = False
+        # Guards the vocabulary; updates and saves run on different executor threads
+        self._lock = threading.Lock()
         self._load_vocabulary()
         _LOGGER.info("TF-IDF embedding engine initialized (dimension: %d)", vector_dim)
 
@@ -44,10 +67,11 @@ class TFIDFEmbeddingEngine:
         """Load vocabulary and IDF statistics from storage."""
         try:
             if os.path.exists(self._vocabulary_file):
-                with open(self._vocabulary_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self._vocabulary_file, 'rb') as f:
+                    data = json_loads(f.read())
                     self._document_count = data.get('document_count', 0)
                     self._term_document_freq = defaultdict(int, data.get('term_df', {}))
+                    self._df_floor = data.get('df_floor', 0)
                 _LOGGER.debug(
                     "Loaded TF-IDF vocabulary: %d docs, %d terms",
                     self._document_count,
@@ -58,74 +82,116 @@ class TFIDFEmbeddingEngine:
 
     def _save_vocabulary(self):
         """Save vocabulary and IDF statistics to storage."""
+        # Snapshot under the lock and write outside it; updates landing during
+        # the write mark the vocabulary dirty again for the next save.
+        with self._lock:
+            data = {
+                'document_count': self._document_count,
+                'term_df': dict(self._term_document_freq),
+                'df_floor': self._df_floor,
+            }
+            self._dirty = False
         try:
-            os.makedirs(os.path.dirname(self._vocabulary_file), exist_ok=True)
-            with open(self._vocabulary_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'document_count': self._document_count,
-                    'term_df': dict(self._term_document_freq)
-                }, f)
+            if not self._storage_dir_ready:
+                os.makedirs(os.path.dirname(self._vocabulary_file), exist_ok=True)
+                self._storage_dir_ready = True
+            # Write to a temp file and swap it in, so a crash mid-write never
+            # leaves a truncated vocabulary behind.
+            temp_file = f"{self._vocabulary_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(json_dumps(data))
+            os.replace(temp_file, self._vocabulary_file)
         except Exception as e:
+            self._dirty = True
+            # Re-check the storage directory on the next save
+            self._storage_dir_ready = False
             _LOGGER.error("Failed to save TF-IDF vocabulary: %s", e)
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
         """Tokenize text into terms."""
-        text = text.lower()
-        tokens = re.findall(r'\b\w+\b', text)
-        return tokens
-
-    def _calculate_tf(self, tokens: List[str]) -> Dict[str, float]:
-        """Calculate term frequency."""
-        if not tokens:
-            return {}
-
-        term_counts = Counter(tokens)
-        max_count = max(term_counts.values())
-
-        tf = {term: count / max_count for term, count in term_counts.items()}
-        return tf
+        return _TOKEN_RE.findall(text.lower())
 
     def _calculate_idf(self, term: str) -> float:
         """Calculate inverse document frequency for a term."""
         if self._document_count == 0:
             return 1.0
 
-        df = self._term_document_freq.get(term, 0)
+        df = max(self._term_document_freq.get(term, 0), self._df_floor)
         idf = math.log((self._document_count + 1) / (df + 1))
         return idf
 
     def _hash_term_to_index(self, term: str) -> int:
-        """Hash a term to a vector index."""
-        return hash(term) % self.vector_dim
-
-    def _create_vector(self, tf_idf: Dict[str, float]) -> List[float]:
-        """Create a fixed-dimension vector from TF-IDF scores."""
-        vector = [0.0] * self.vector_dim
+        """Hash a term to a vector index.
 
-        for term, score in tf_idf.items():
-            idx = self._hash_term_to_index(term)
-            vector[idx] += score
-
-        magnitude = math.sqrt(sum(x * x for x in vector))
+        Uses CRC32 rather than hash(), which is salted per process and would
+        map the same term to different indices after every restart.
+        """
+        idx = self._index_cache.get(term)
+        if idx is None:
+            if len(self._index_cache) >= _INDEX_CACHE_MAX:
+                self._index_cache.clear()
+            idx = zlib.crc32(term.encode("utf-8")) % self.vector_dim
+            self._index_cache[term] = idx
+        return idx
+
+    def _scatter_normalize(self, indices: np.ndarray, scores: np.ndarray) -> List[float]:
+        """Sum scores into their hashed buckets and L2-normalize the result."""
+        # Colliding terms sum into the same bucket
+        vector = np.bincount(indices, weights=scores, minlength=self.vector_dim)
+
+        magnitude = np.linalg.norm(vector)
         if magnitude > 0:
-            vector = [x / magnitude for x in vector]
+            vector /= magnitude
 
-        return vector
+        return vector.tolist()
 
     def update_vocabulary(self, text: str):
-        """Update vocabulary with a new document (for IDF calculation)."""
+        """Update vocabulary with a new document (for IDF calculation).
+
+        The change is kept in memory; flush() persists it.
+        """
         tokens = self._tokenize(text)
         if not tokens:
             return
 
-        self._document_count += 1
-
         unique_terms = set(tokens)
-        for term in unique_terms:
-            self._term_document_freq[term] += 1
+        with self._lock:
+            self._document_count += 1
+            for term in unique_terms:
+                self._term_document_freq[term] += 1
+
+            if len(self._term_document_freq) > _VOCAB_MAX_TERMS:
+                self._prune_vocabulary()
+
+            self._dirty = True
 
-        if self._document_count % 10 == 0:
+    def _prune_vocabulary(self):
+        """Shrink the vocabulary below _VOCAB_PRUNE_TARGET terms.
+
+        Terms seen in a single document go first; if that is not enough, only
+        the most frequent terms are kept. The highest document frequency
+        dropped becomes _df_floor, so pruned terms keep that frequency in
+        _calculate_idf instead of jumping to the unseen-term IDF. Called with
+        _lock held.
+        """
+        before = len(self._term_document_freq)
+        kept = {term: df for term, df in self._term_document_freq.items() if df > 1}
+        floor = 1 if len(kept) < before else 0
+        if len(kept) > _VOCAB_PRUNE_TARGET:
+            kept = dict(heapq.nlargest(_VOCAB_PRUNE_TARGET, kept.items(), key=itemgetter(1)))
+            floor = max(
+                df for term, df in self._term_document_freq.items() if term not in kept
+            )
+        self._df_floor = max(self._df_floor, floor)
+        self._term_document_freq = defaultdict(int, kept)
+        _LOGGER.debug(
+            "Pruned TF-IDF vocabulary from %d to %d terms", before, len(kept)
+        )
+
+    def flush(self):
+        """Save the vocabulary if it changed since the last save."""
+        if self._dirty:
             self._save_vocabulary()
 
     def generate_embedding(self, text: str) -> List[float]:
@@ -134,16 +200,19 @@ class TFIDFEmbeddingEngine:
         if not tokens:
             return [0.0] * self.vector_dim
 
-        tf = self._calculate_tf(tokens)
-
-        tf_idf = {}
-        for term, tf_score in tf.items():
-            idf_score = self._calculate_idf(term)
-            tf_idf[term] = tf_score * idf_score
-
-        vector = self._create_vector(tf_idf)
+        # Max-normalized term frequency times IDF, as array operations over
+        # the unique terms.
+        term_counts = Counter(tokens)
+        count = len(term_counts)
+        indices = np.fromiter(
+            (self._hash_term_to_index(term) for term in term_counts), dtype=np.intp, count=count
+        )
+        idf = np.fromiter(
+            (self._calculate_idf(term) for term in term_counts), dtype=np.float64, count=count
+        )
+        counts = np.fromiter(term_counts.values(), dtype=np.float64, count=count)
 
-        return vector
+        return self._scatter_normalize(indices, counts / counts.max() * idf)
 
     async def async_generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text asynchronously."""
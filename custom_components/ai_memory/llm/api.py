@@ -14,11 +14,21 @@ API_ID = "memory_api"
 
 
 async def async_setup(hass: HomeAssistant):
-    """Set up the Memory LLM API."""
+    """Set up the Memory LLM API.
+
+    The API outlives config entry reloads, so it is registered only once.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get("llm_api_registered"):
+        return
+
     try:
         llm.async_register_api(hass, MemoryAPI(hass))
     except Exception as e:
         _LOGGER.debug("Memory LLM API registration skipped: %s", e)
+        return
+
+    domain_data["llm_api_registered"] = True
 
 
 class MemoryAPI(llm.API):
@@ -26,6 +36,9 @@ class MemoryAPI(llm.API):
 
     def __init__(self, hass: HomeAssistant) -> None:
         super().__init__(hass=hass, id=API_ID, name="Memory Management")
+        # Tools only hold a manager reference; rebuild them when it changes
+        self._tools_manager = None
+        self._tools: tuple = ()
 
     async def async_get_api_instance(self, llm_context: llm.LLMContext) -> llm.APIInstance:
         manager = self.hass.data.get(DOMAIN, {}).get("manager")
@@ -34,15 +47,17 @@ class MemoryAPI(llm.API):
             _LOGGER.error("Memory Manager not initialized")
             return llm.APIInstance(self, "Error: Memory system unavailable", llm_context, [])
 
-        tools = [
-            AddMemoryTool(manager),
-            SearchMemoryTool(manager),
-            DeleteMemoryTool(manager),
-        ]
+        if manager is not self._tools_manager:
+            self._tools = (
+                AddMemoryTool(manager),
+                SearchMemoryTool(manager),
+                DeleteMemoryTool(manager),
+            )
+            self._tools_manager = manager
 
         return llm.APIInstance(
             api=self,
             api_prompt=MEMORY_SYSTEM_PROMPT,
             llm_context=llm_context,
-            tools=tools,
+            tools=list(self._tools),
         )
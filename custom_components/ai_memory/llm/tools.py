@@ -6,6 +6,7 @@ import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.util.json import JsonObjectType
 
+from ..constants import SCOPES
 from ..utils import format_date
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ class AddMemoryTool(llm.Tool):
 
     parameters = vol.Schema({
         vol.Required("content"): str,
-        vol.Required("scope"): vol.In(["private", "common"]),
+        vol.Required("scope"): vol.In(SCOPES),
         vol.Optional("summary", default=""): str,
         vol.Optional("wing", default=""): str,
         vol.Optional("room", default=""): str,
@@ -91,9 +92,10 @@ class SearchMemoryTool(llm.Tool):
             if not results:
                 return {"success": True, "message": "No matching memories found."}
 
-            formatted = ""
-            for memory in results:
-                formatted += f"[{format_date(memory['created_at'])}] {memory['content']}\n"
+            formatted = "\n".join(
+                f"[{format_date(memory['created_at'])}] {memory['content']}"
+                for memory in results
+            )
 
             return {
                 "success": True,
@@ -116,7 +118,7 @@ class DeleteMemoryTool(llm.Tool):
     parameters = vol.Schema({
         vol.Optional("room"): str,
         vol.Optional("wing"): str,
-        vol.Optional("scope"): vol.In(["private", "common"]),
+        vol.Optional("scope"): vol.In(SCOPES),
     })
 
     def __init__(self, memory_manager):
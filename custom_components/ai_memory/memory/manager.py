@@ -1,4 +1,5 @@
 """Memory Manager for AI Memory integration (refactored)."""
+import asyncio
 import logging
 import uuid
 from datetime import datetime
@@ -13,6 +14,7 @@ from ..constants import (
     MEMORY_MAX_ENTRIES,
     DEFAULT_STORAGE_PATH,
     DEFAULT_LAYER,
+    SCOPES,
 )
 from ..embedding.engine import EmbeddingEngine
 from ..palace.metadata import RoomDetector
@@ -20,6 +22,15 @@ from ..palace.structure import PalaceStructure
 
 _LOGGER = logging.getLogger(__name__)
 
+_EVICT_OLDEST_SQL = """DELETE FROM memories
+   WHERE id = (SELECT id FROM memories ORDER BY created_at ASC LIMIT 1)
+   AND (SELECT COUNT(*) FROM memories) >= ?"""
+
+_INSERT_MEMORY_SQL = """INSERT INTO memories
+   (id, content, embedding, scope, agent_id, created_at,
+    summary, wing, room, layer, updated_at, accessed_at, access_count)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
 
 class MemoryManager:
     """Manages the memory storage using SQLite with wing/room support."""
@@ -52,6 +63,15 @@ class MemoryManager:
         # Initialize search engine
         self._search = MemorySearch(self._store, self._embedding_engine)
 
+        # Bumped on every write; invalidates cached list results
+        self._version = 0
+        self._memories_cache: Optional[tuple] = None  # (version, filters, memories)
+
+        # Rows queued while a write is in flight; committed together by the next writer
+        self._pending_writes: List[tuple] = []  # (row, embedding_dim, future)
+        self._write_lock = asyncio.Lock()
+        self._commit_task: Optional[asyncio.Task] = None
+
     async def async_initialize(self):
         """Initialize the memory manager and embedding engine."""
         if self._embedding_engine:
@@ -63,18 +83,21 @@ class MemoryManager:
                 if is_ready:
                     _LOGGER.info("Remote embedding service is reachable.")
                     if hasattr(self._embedding_engine._engine, "async_load_model"):
-                        await self._embedding_engine._engine.async_load_model()
+                        # A first pull can download gigabytes; don't hold up setup
+                        self.hass.async_create_background_task(
+                            self._embedding_engine._engine.async_load_model(),
+                            "ai_memory_model_pull",
+                        )
                 else:
                     _LOGGER.error("Remote embedding service is NOT reachable at startup.")
                     raise RuntimeError("Remote embedding service is not reachable")
 
-    async def async_get_memory_counts(self) -> Dict[str, int]:
-        """Get counts of memories by scope."""
+    def _query_memory_counts(self) -> Dict[str, int]:
+        """Count memories by scope (runs in executor)."""
         counts = {"common": 0, "private": 0, "total": 0}
         try:
-            rows = await self.hass.async_add_executor_job(
-                self._store.execute_query,
-                "SELECT scope, COUNT(*) FROM memories GROUP BY scope",
+            rows = self._store.execute_query(
+                "SELECT scope, COUNT(*) FROM memories GROUP BY scope"
             )
             for scope, count in rows:
                 counts[scope] = count
@@ -83,13 +106,12 @@ class MemoryManager:
             _LOGGER.error("Failed to get memory counts: %s", e)
         return counts
 
-    async def async_get_layer_counts(self) -> Dict[str, int]:
-        """Get counts of memories by layer."""
+    def _query_layer_counts(self) -> Dict[str, int]:
+        """Count memories by layer (runs in executor)."""
         counts = {"L0": 0, "L1": 0, "L2": 0, "L3": 0}
         try:
-            rows = await self.hass.async_add_executor_job(
-                self._store.execute_query,
-                "SELECT layer, COUNT(*) FROM memories GROUP BY layer",
+            rows = self._store.execute_query(
+                "SELECT layer, COUNT(*) FROM memories GROUP BY layer"
             )
             for layer, count in rows:
                 key = f"L{layer}"
@@ -99,13 +121,12 @@ class MemoryManager:
             _LOGGER.error("Failed to get layer counts: %s", e)
         return counts
 
-    async def async_get_wing_counts(self) -> Dict[str, int]:
-        """Get counts of memories by wing."""
+    def _query_wing_counts(self) -> Dict[str, int]:
+        """Count memories by wing (runs in executor)."""
         counts = {}
         try:
-            rows = await self.hass.async_add_executor_job(
-                self._store.execute_query,
-                "SELECT wing, COUNT(*) FROM memories GROUP BY wing",
+            rows = self._store.execute_query(
+                "SELECT wing, COUNT(*) FROM memories GROUP BY wing"
             )
             for wing, count in rows:
                 counts[wing] = count
@@ -113,6 +134,24 @@ class MemoryManager:
             _LOGGER.error("Failed to get wing counts: %s", e)
         return counts
 
+    def _query_stats(self) -> Dict[str, Dict]:
+        """Collect all sensor statistics in one pass (runs in executor)."""
+        try:
+            palace_stats = self._palace.get_stats()
+        except Exception:
+            palace_stats = {"wings": 0, "rooms": 0}
+
+        return {
+            "memory_counts": self._query_memory_counts(),
+            "layer_counts": self._query_layer_counts(),
+            "wing_counts": self._query_wing_counts(),
+            "palace_stats": palace_stats,
+        }
+
+    async def async_get_stats(self) -> Dict[str, Dict]:
+        """Get memory, layer, wing and palace statistics in a single executor job."""
+        return await self.hass.async_add_executor_job(self._query_stats)
+
     async def async_get_memories(
         self,
         limit: int = 50,
@@ -121,7 +160,16 @@ class MemoryManager:
         scope: Optional[str] = None,
         agent_id: Optional[str] = None,
     ) -> List[Dict]:
-        """Get memories with optional filtering."""
+        """Get memories with optional filtering.
+
+        The last result is cached until the next add or delete; callers get
+        copies, so mutating them cannot corrupt the cache.
+        """
+        filters = (limit, room, wing, scope, agent_id)
+        cache = self._memories_cache
+        if cache and cache[0] == self._version and cache[1] == filters:
+            return [dict(m) for m in cache[2]]
+
         conditions = []
         params = []
         
@@ -145,6 +193,7 @@ class MemoryManager:
         params.append(limit)
 
         memories = []
+        version = self._version
         try:
             rows = await self.hass.async_add_executor_job(
                 self._store.execute_query,
@@ -163,9 +212,11 @@ class MemoryManager:
                     "room": row[7],
                     "layer": row[8],
                 })
+            self._memories_cache = (version, filters, memories)
         except Exception as e:
             _LOGGER.error("Failed to get memories: %s", e)
-        return memories
+            return memories
+        return [dict(m) for m in memories]
 
     async def async_add_memory(
         self,
@@ -190,23 +241,12 @@ class MemoryManager:
             _LOGGER.warning("Cannot add empty memory")
             return
 
-        if scope not in ["common", "private"]:
+        if scope not in SCOPES:
             raise ValueError(f"Invalid scope: {scope}")
 
         if scope == "private" and not agent_id:
             raise ValueError("Agent ID required for private scope")
 
-        # Check limit
-        count_res = await self.hass.async_add_executor_job(
-            self._store.execute_query,
-            "SELECT COUNT(*) FROM memories",
-        )
-        if count_res and count_res[0][0] >= self._max_entries:
-            await self.hass.async_add_executor_job(
-                self._store.execute_commit,
-                "DELETE FROM memories WHERE id = (SELECT id FROM memories ORDER BY created_at ASC LIMIT 1)",
-            )
-
         # Determine wing/room (auto-detect if not provided)
         if not wing or not room:
             detected_wing, detected_room = self._room_detector.detect(content, scope)
@@ -222,19 +262,13 @@ class MemoryManager:
         # Generate embedding from summary (if available) or content
         embedding_text = summary if summary else content
         embedding = None
+        embedding_dim = None
         try:
             raw_embedding = await self._embedding_engine.async_generate_embedding(embedding_text)
             if raw_embedding:
-                # Auto-detect and persist embedding dimension on first success
-                current_dim = await self.hass.async_add_executor_job(
-                    self._store.get_embedding_dim
-                )
-                if current_dim != len(raw_embedding):
-                    await self.hass.async_add_executor_job(
-                        self._store.set_embedding_dim, len(raw_embedding)
-                    )
+                embedding_dim = len(raw_embedding)
                 embedding = self._store.validate_embedding(
-                    raw_embedding, expected_dim=len(raw_embedding)
+                    raw_embedding, expected_dim=embedding_dim
                 )
         except Exception as e:
             _LOGGER.error("Failed to generate embedding: %s", e)
@@ -243,12 +277,7 @@ class MemoryManager:
         mem_id = str(uuid.uuid4())
         created_at = datetime.now().isoformat()
 
-        await self.hass.async_add_executor_job(
-            self._store.execute_commit,
-            """INSERT INTO memories
-               (id, content, embedding, scope, agent_id, created_at,
-                summary, wing, room, layer, updated_at, accessed_at, access_count)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        await self._async_write_memory(
             (
                 mem_id,
                 content.strip(),
@@ -264,7 +293,10 @@ class MemoryManager:
                 None,
                 0,
             ),
+            embedding_dim if embedding else None,
         )
+        # Invalidate before awaiting anything else, so readers see the new row
+        self._async_notify_updated()
 
         # Update vocabulary for TF-IDF engine
         if self._embedding_engine:
@@ -273,8 +305,86 @@ class MemoryManager:
             except Exception as e:
                 _LOGGER.debug("Vocabulary update skipped: %s", e)
 
-        if hasattr(self.hass, "bus"):
-            self.hass.bus.async_fire("ai_memory_updated")
+    async def _async_write_memory(self, row: tuple, embedding_dim: Optional[int] = None):
+        """Queue a memory row and wait until it is committed.
+
+        Adds that arrive while another write is in flight (e.g. a burst of
+        add_memory tool calls) are committed together in the next transaction,
+        so the burst costs one executor hop and one commit instead of one each.
+
+        Args:
+            row: Values for _INSERT_MEMORY_SQL.
+            embedding_dim: Dimension of the row's embedding, persisted on first use.
+        """
+        done = asyncio.get_running_loop().create_future()
+        entry = (row, embedding_dim, done)
+        self._pending_writes.append(entry)
+
+        try:
+            async with self._write_lock:
+                # A cancelled writer leaves its commit running; never overlap commits
+                if self._commit_task is not None and not self._commit_task.done():
+                    await asyncio.shield(self._commit_task)
+                if self._pending_writes:
+                    batch, self._pending_writes = self._pending_writes, []
+                    # Shielded so cancelling this caller cannot strand the rows it took
+                    self._commit_task = asyncio.get_running_loop().create_task(
+                        self._async_commit_batch(batch)
+                    )
+                    await asyncio.shield(self._commit_task)
+        except asyncio.CancelledError:
+            # Cancelled before any commit took the row: drop it, otherwise a
+            # later writer would commit it without notifying list listeners
+            if entry in self._pending_writes:
+                self._pending_writes.remove(entry)
+            raise
+
+        await done
+
+    async def _async_commit_batch(self, batch: List[tuple]):
+        """Commit queued rows and resolve the future of every caller in the batch.
+
+        Args:
+            batch: List of (row, embedding_dim, future) tuples.
+        """
+        try:
+            await self.hass.async_add_executor_job(
+                self._write_memories, [(r, d) for r, d, _ in batch]
+            )
+        except BaseException as e:
+            for _, _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+        else:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def _write_memories(self, rows: List[tuple]):
+        """Persist new memory rows (runs in executor).
+
+        Eviction of the oldest entry (when the store is full) and each insert run
+        in a single transaction.
+
+        Args:
+            rows: List of (row, embedding_dim) tuples, row being the values for
+                _INSERT_MEMORY_SQL.
+        """
+        statements = []
+        for row, embedding_dim in rows:
+            # Auto-detect and persist embedding dimension on first success
+            if embedding_dim and self._store.get_embedding_dim() != embedding_dim:
+                self._store.set_embedding_dim(embedding_dim)
+            statements.append((_EVICT_OLDEST_SQL, (self._max_entries,)))
+            statements.append((_INSERT_MEMORY_SQL, row))
+
+        self._store.execute_transaction(statements)
 
     async def async_search_memory(
         self,
@@ -374,8 +484,7 @@ class MemoryManager:
                 tuple(params),
             )
 
-            if hasattr(self.hass, "bus"):
-                self.hass.bus.async_fire("ai_memory_updated")
+            self._async_notify_updated()
 
             _LOGGER.info("Deleted %d memory(s)", deleted_count)
             return deleted_count
@@ -383,6 +492,24 @@ class MemoryManager:
             _LOGGER.error("Failed to delete memory: %s", e)
             return 0
 
+    def _async_notify_updated(self):
+        """Invalidate cached results and notify listeners of a change."""
+        self._version += 1
+        if hasattr(self.hass, "bus"):
+            self.hass.bus.async_fire("ai_memory_updated")
+
+    def flush(self):
+        """Persist unsaved embedding state (blocking, run in executor)."""
+        if self._embedding_engine:
+            self._embedding_engine.flush()
+
+    def async_cancel_scheduled_flush(self):
+        """Cancel a pending embedding state flush before close() takes over."""
+        if self._embedding_engine:
+            self._embedding_engine.async_cancel_scheduled_flush()
+
     def close(self):
-        """Close database connection and release resources."""
+        """Flush embedding state, close the database and release resources."""
+        if self._embedding_engine:
+            self._embedding_engine.close()
         self._store.close()
@@ -139,6 +139,21 @@ class MigrationManager:
         self._set_version(1)
         _LOGGER.info("Migration v0 → v1 complete")
 
+    def _migrate_v1_to_v2(self):
+        """Migrate from v1 to v2.
+
+        Creates: created_at index, so evicting the oldest memory and ordering
+        text-fallback results by recency no longer scan and sort the table.
+        """
+        _LOGGER.info("Running migration: v1 → v2")
+
+        self._store.execute_commit(
+            "CREATE INDEX IF NOT EXISTS idx_memories_created_at ON memories(created_at)"
+        )
+
+        self._set_version(2)
+        _LOGGER.info("Migration v1 → v2 complete")
+
     def migrate(self):
         """Run all pending migrations."""
         self._ensure_meta_table()
@@ -167,5 +182,9 @@ class MigrationManager:
                     )"""
                 )
             self._migrate_v0_to_v1()
+            current_version = 1
+
+        if current_version < 2:
+            self._migrate_v1_to_v2()
 
         _LOGGER.debug("Database schema up to date (v%d)", DB_VERSION)
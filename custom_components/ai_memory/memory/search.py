@@ -1,15 +1,29 @@
 """Semantic search engine for AI Memory integration."""
-import json
 import logging
+from datetime import datetime
 from typing import List, Dict, Optional
 
 import numpy as np
 
 from ..constants import SIMILARITY_THRESHOLD, MEMORY_LIMIT, EMBEDDINGS_VECTOR_DIM
 from .store import MemoryStore
+from ..utils import json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
+_SEARCH_SQL = """SELECT id, content, embedding, scope, agent_id, created_at,
+                        summary, wing, room, layer, access_count
+                 FROM memories
+                 WHERE (scope = 'common' OR (scope = 'private' AND agent_id = ?))"""
+
+# Query text per (has_wing, has_room); fixed strings keep sqlite3's statement cache warm
+_SEARCH_SQL_BY_FILTER = {
+    (False, False): _SEARCH_SQL,
+    (True, False): _SEARCH_SQL + " AND wing = ?",
+    (False, True): _SEARCH_SQL + " AND room = ?",
+    (True, True): _SEARCH_SQL + " AND wing = ? AND room = ?",
+}
+
 
 class MemorySearch:
     """Semantic search using vector similarity (NumPy optimized)."""
@@ -34,22 +48,50 @@ class MemorySearch:
             dim = self._store.get_embedding_dim()
             return [0.0] * dim
 
-        from homeassistant.core import HomeAssistant
         # Delegate to the embedding engine's async method
         return await self._embedding_engine.async_generate_embedding(text)
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity using NumPy."""
-        if vec1.shape != vec2.shape:
-            return 0.0
+    @staticmethod
+    def _score_rows(query_vec: np.ndarray, rows: List[tuple]) -> List[tuple]:
+        """Score memory rows against the query vector in one matrix product.
+
+        Rows without an embedding, or whose embedding does not match the query
+        dimension, are skipped.
+
+        Args:
+            query_vec: Query embedding.
+            rows: Rows from _SEARCH_SQL; the embedding JSON is at index 2.
 
-        norm_v1 = np.linalg.norm(vec1)
-        norm_v2 = np.linalg.norm(vec2)
+        Returns:
+            List of (row, cosine similarity) tuples.
+        """
+        dim = query_vec.shape[0]
+        candidates = []
+        vectors = []
+        for row in rows:
+            emb_json = row[2]
+            if not emb_json:
+                continue
+            try:
+                vector = json_loads(emb_json)
+            except Exception as e:
+                _LOGGER.warning("Error processing memory row: %s", e)
+                continue
+            if isinstance(vector, list) and len(vector) == dim:
+                candidates.append(row)
+                vectors.append(vector)
 
-        if norm_v1 == 0 or norm_v2 == 0:
-            return 0.0
+        query_norm = np.linalg.norm(query_vec)
+        if not candidates or query_norm == 0:
+            return []
 
-        return float(np.dot(vec1, vec2) / (norm_v1 * norm_v2))
+        matrix = np.array(vectors, dtype=np.float32)
+        dots = matrix @ query_vec
+        denominators = np.linalg.norm(matrix, axis=1) * query_norm
+        scores = np.divide(
+            dots, denominators, out=np.zeros_like(dots), where=denominators > 0
+        )
+        return list(zip(candidates, scores.tolist()))
 
     async def async_search(
         self,
@@ -84,19 +126,12 @@ class MemorySearch:
         if room:
             room = room.lower().strip()
 
-        # Build SQL WHERE clause with optional wing/room filters
-        sql = """SELECT id, content, embedding, scope, agent_id, created_at,
-                        summary, wing, room, layer, access_count
-                 FROM memories
-                 WHERE (scope = 'common' OR (scope = 'private' AND agent_id = ?))"""
+        # Pick the precomputed query for the optional wing/room filters
+        sql = _SEARCH_SQL_BY_FILTER[bool(wing), bool(room)]
         params: list = [agent_id]
-
         if wing:
-            sql += " AND wing = ?"
             params.append(wing)
-
         if room:
-            sql += " AND room = ?"
             params.append(room)
 
         # Execute query
@@ -118,42 +153,35 @@ class MemorySearch:
             return []
 
         query_vec = np.array(query_embedding, dtype=np.float32)
+        scores = self._score_rows(query_vec, rows)
 
-        # Score memories using cosine similarity
         scored_memories = []
         result_ids = []
+        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
 
-        for row in rows:
-            memory_id, content, emb_json, scope, row_agent_id, created_at, \
-                summary, mem_wing, mem_room, layer, access_count = row
-
-            try:
-                mem_embedding_list = json.loads(emb_json) if emb_json else None
-                if not mem_embedding_list:
-                    continue
-
-                mem_vec = np.array(mem_embedding_list, dtype=np.float32)
-                score = self._cosine_similarity(query_vec, mem_vec)
-
-                if score > min_score:
-                    _LOGGER.debug("[%.3f] %s", score, content)
-                    result_ids.append(memory_id)
-                    scored_memories.append({
-                        "id": memory_id,
-                        "content": content,
-                        "score": float(score),
-                        "scope": scope,
-                        "agent_id": row_agent_id,
-                        "created_at": created_at,
-                        "summary": summary,
-                        "wing": mem_wing,
-                        "room": mem_room,
-                        "layer": layer,
-                    })
-            except Exception as e:
-                _LOGGER.warning("Error processing memory row: %s", e)
+        for row, score in scores:
+            if score <= min_score:
                 continue
 
+            memory_id, content, _, scope, row_agent_id, created_at, \
+                summary, mem_wing, mem_room, layer, _ = row
+
+            if debug_enabled:
+                _LOGGER.debug("[%.3f] %s", score, content)
+            result_ids.append(memory_id)
+            scored_memories.append({
+                "id": memory_id,
+                "content": content,
+                "score": score,
+                "scope": scope,
+                "agent_id": row_agent_id,
+                "created_at": created_at,
+                "summary": summary,
+                "wing": mem_wing,
+                "room": mem_room,
+                "layer": layer,
+            })
+
         # Sort by score descending
         scored_memories.sort(key=lambda x: x["score"], reverse=True)
         result = scored_memories[:limit]
@@ -168,7 +196,6 @@ class MemorySearch:
 
         # Update access_count for returned results (batch)
         if result_ids and hass:
-            from datetime import datetime
             now = datetime.now().isoformat()
             # Only update IDs that made it into the result
             update_ids = [m["id"] for m in result]
@@ -199,7 +226,9 @@ class MemorySearch:
         Searches content and summary fields using LIKE matching.
         Each token in the query is matched independently (OR logic).
         """
-        tokens = [t.lower() for t in query.split() if len(t) > 1]
+        # dict.fromkeys keeps first-seen order while dropping repeated tokens,
+        # so each distinct token adds only one pair of LIKE clauses.
+        tokens = list(dict.fromkeys(t.lower() for t in query.split() if len(t) > 1))
         if not tokens or not hass:
             return []
 
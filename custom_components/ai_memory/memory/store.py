@@ -1,10 +1,10 @@
 """SQLite store with WAL mode, connection reuse, and transaction safety."""
-import json
 import logging
 import sqlite3
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Tuple
 
 from ..constants import EMBEDDINGS_VECTOR_DIM
+from ..utils import JSONDecodeError, json_dumps, json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -98,6 +98,29 @@ class MemoryStore:
             _LOGGER.error("Database batch write error: %s", e)
             raise
 
+    def execute_transaction(self, statements: List[Tuple[str, tuple]]):
+        """Execute several write queries atomically in a single transaction.
+
+        Args:
+            statements: List of (query, params) tuples, executed in order.
+        """
+        if not statements:
+            return
+
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN")
+            for query, params in statements:
+                conn.execute(query, params)
+            conn.execute("COMMIT")
+        except Exception as e:
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+            _LOGGER.error("Database transaction error: %s", e)
+            raise
+
     @staticmethod
     def validate_embedding(embedding: Any, expected_dim: int = None) -> Optional[str]:
         """Validate and serialize an embedding vector.
@@ -120,7 +143,7 @@ class MemoryStore:
             )
             return None
 
-        return json.dumps(embedding)
+        return json_dumps(embedding)
 
     def get_embedding_dim(self) -> int:
         """Get the detected embedding dimension.
@@ -148,13 +171,13 @@ class MemoryStore:
         )
         if rows and rows[0][0]:
             try:
-                existing = json.loads(rows[0][0])
+                existing = json_loads(rows[0][0])
                 if existing:
                     self._embedding_dim = len(existing)
                     self._persist_embedding_dim(self._embedding_dim)
                     _LOGGER.info("Auto-detected embedding dimension: %d (from existing data)", self._embedding_dim)
                     return self._embedding_dim
-            except (json.JSONDecodeError, IndexError):
+            except (JSONDecodeError, IndexError):
                 pass
 
         # Fallback to constant
@@ -1,5 +1,5 @@
 """Default palace structure definitions."""
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 DEFAULT_PALACE: List[Dict] = [
     {"wing": "household", "rooms": ["devices", "maintenance", "events"], "scope": "common"},
@@ -10,15 +10,15 @@ DEFAULT_PALACE: List[Dict] = [
 
 # English technology terms — LLM determines wing/room language-independently,
 # these keywords are only used as fallback when LLM doesn't provide parameters.
-ROOM_KEYWORDS: Dict[str, List[str]] = {
-    "devices": ["device", "light", "switch", "sensor", "thermostat", "camera", "speaker", "tv", "lock"],
-    "maintenance": ["broken", "repair", "fix", "replace", "battery", "filter"],
-    "preferences": ["prefer", "like", "dislike", "favorite", "hate", "love"],
-    "routines": ["routine", "morning", "evening", "schedule", "alarm"],
-    "health": ["medicine", "doctor", "allergy"],
-    "events": ["visit", "guest", "party"],
-    "secrets": ["password", "code", "pin"],
-    "schedules": ["schedule", "calendar", "plan"],
+ROOM_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "devices": ("device", "light", "switch", "sensor", "thermostat", "camera", "speaker", "tv", "lock"),
+    "maintenance": ("broken", "repair", "fix", "replace", "battery", "filter"),
+    "preferences": ("prefer", "like", "dislike", "favorite", "hate", "love"),
+    "routines": ("routine", "morning", "evening", "schedule", "alarm"),
+    "health": ("medicine", "doctor", "allergy"),
+    "events": ("visit", "guest", "party"),
+    "secrets": ("password", "code", "pin"),
+    "schedules": ("schedule", "calendar", "plan"),
 }
 
 # Scope-based defaults when no keyword matches
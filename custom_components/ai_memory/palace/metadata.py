@@ -10,6 +10,8 @@ from .structure import PalaceStructure
 
 _LOGGER = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\b\w+\b")
+
 
 class RoomDetector:
     """Detects wing/room from content using keyword matching.
@@ -55,18 +57,17 @@ class RoomDetector:
         # 1. Keyword matching
         self._ensure_keywords_loaded()
         if self._keyword_map:
-            tokens = re.findall(r'\b\w+\b', content.lower())
-            match_counts: dict = {}  # "wing/room" -> count
+            keyword_map = self._keyword_map
+            match_counts: dict = {}  # (wing, room) -> count
 
-            for token in tokens:
-                match = self._keyword_map.get(token)
+            for token in _TOKEN_RE.findall(content.lower()):
+                match = keyword_map.get(token)
                 if match:
-                    key = f"{match['wing']}/{match['room']}"
+                    key = (match["wing"], match["room"])
                     match_counts[key] = match_counts.get(key, 0) + 1
 
             if match_counts:
-                best_match = max(match_counts, key=match_counts.get)
-                wing, room = best_match.split("/")
+                wing, room = max(match_counts, key=match_counts.get)
                 _LOGGER.debug("Room detected: %s/%s (keyword match)", wing, room)
                 return wing, room
 
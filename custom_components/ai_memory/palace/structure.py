@@ -1,7 +1,8 @@
 """Palace structure management (Wing/Room/Hall/Tunnel)."""
 import json
 import logging
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 from .defaults import DEFAULT_PALACE, ROOM_KEYWORDS
 from ..memory.store import MemoryStore
@@ -19,6 +20,8 @@ class PalaceStructure:
             store: MemoryStore instance for database access.
         """
         self._store = store
+        # (wing, room) pairs known to exist, so repeat adds skip the lookup
+        self._known_rooms: set = set()
 
     def validate_or_create_room(self, wing: str, room: str, scope: str = "common") -> tuple:
         """Normalize wing/room to lowercase and auto-create if unknown.
@@ -40,6 +43,9 @@ class PalaceStructure:
         if not wing or not room:
             return wing, room
 
+        if (wing, room) in self._known_rooms:
+            return wing, room
+
         # Check if room exists in palace_structure
         rows = self._store.execute_query(
             "SELECT COUNT(*) FROM palace_structure WHERE wing = ? AND room = ?",
@@ -49,6 +55,8 @@ class PalaceStructure:
             # Auto-create unknown room
             self.add_room(wing, room, scope)
             _LOGGER.info("Auto-created room %s/%s (LLM-provided)", wing, room)
+        else:
+            self._known_rooms.add((wing, room))
 
         return wing, room
 
@@ -59,17 +67,21 @@ class PalaceStructure:
             _LOGGER.debug("Palace structure already initialized (%d rooms)", rows[0][0])
             return
 
+        params_list = []
         for wing_data in DEFAULT_PALACE:
             wing = wing_data["wing"]
             scope = wing_data.get("scope", "common")
             for room in wing_data["rooms"]:
-                keywords = ROOM_KEYWORDS.get(room, [])
-                self._store.execute_commit(
-                    """INSERT OR IGNORE INTO palace_structure
-                       (wing, room, scope, auto_assign_keywords)
-                       VALUES (?, ?, ?, ?)""",
-                    (wing, room, scope, json.dumps(keywords)),
-                )
+                keywords = ROOM_KEYWORDS.get(room, ())
+                params_list.append((wing, room, scope, json.dumps(keywords)))
+
+        self._store.execute_commit_many(
+            """INSERT OR IGNORE INTO palace_structure
+               (wing, room, scope, auto_assign_keywords)
+               VALUES (?, ?, ?, ?)""",
+            params_list,
+        )
+        self._known_rooms.update((wing, room) for wing, room, _, _ in params_list)
 
         _LOGGER.info("Initialized default palace structure (%d wings)", len(DEFAULT_PALACE))
 
@@ -85,9 +97,7 @@ class PalaceStructure:
 
         structure: Dict[str, List[Dict]] = {}
         for wing, room, scope, keywords_json in rows:
-            if wing not in structure:
-                structure[wing] = []
-            structure[wing].append({
+            structure.setdefault(wing, []).append({
                 "room": room,
                 "scope": scope,
                 "keywords": json.loads(keywords_json) if keywords_json else [],
@@ -110,6 +120,7 @@ class PalaceStructure:
                VALUES (?, ?, ?, ?)""",
             (wing, room, scope, json.dumps(keywords or [])),
         )
+        self._known_rooms.add((wing, room))
         _LOGGER.info("Added room %s/%s (scope: %s)", wing, room, scope)
 
     def remove_room(self, wing: str, room: str):
@@ -136,23 +147,28 @@ class PalaceStructure:
             "DELETE FROM palace_structure WHERE wing = ? AND room = ?",
             (wing, room),
         )
+        self._known_rooms.discard((wing, room))
         _LOGGER.info("Removed room %s/%s", wing, room)
 
-    def get_all_keywords(self) -> Dict[str, Dict]:
+    def get_all_keywords(self) -> Dict[str, Mapping]:
         """Get all room keywords for detection.
 
         Returns:
-            Dict mapping keyword -> {wing, room} for quick lookup.
+            Dict mapping keyword -> read-only {wing, room} for quick lookup.
+            All keywords of a room share one mapping.
         """
         rows = self._store.execute_query(
             "SELECT wing, room, auto_assign_keywords FROM palace_structure"
         )
 
-        keyword_map: Dict[str, Dict] = {}
+        keyword_map: Dict[str, Mapping] = {}
         for wing, room, keywords_json in rows:
             keywords = json.loads(keywords_json) if keywords_json else []
+            if not keywords:
+                continue
+            location = MappingProxyType({"wing": wing, "room": room})
             for kw in keywords:
-                keyword_map[kw.lower()] = {"wing": wing, "room": room}
+                keyword_map[kw.lower()] = location
 
         return keyword_map
 
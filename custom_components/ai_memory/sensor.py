@@ -49,44 +49,28 @@ class AIMemorySensor(SensorEntity):
         self._attr_icon = "mdi:brain"
         self._attr_entity_registry_enabled_default = True
         self._scan_interval = scan_interval
-        self._memory_counts = {}
-        self._layer_counts = {}
-        self._wing_counts = {}
-        self._palace_stats = {}
+        self._attr_native_value = "Active"
 
-    @property
-    def state(self):
-        return "Active"
+    async def async_update(self):
+        """Update sensor state."""
+        stats = await self.memory_manager.async_get_stats()
 
-    @property
-    def extra_state_attributes(self):
+        # Built once per refresh rather than on every state read
         attrs = {
             "embedding_engine": self.memory_manager._embedding_engine.engine_name,
             "max_entries": self.memory_manager._max_entries,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "memory_counts": self._memory_counts,
-            "layer_distribution": self._layer_counts,
-            "wing_distribution": self._wing_counts,
-            "palace_structure": self._palace_stats,
+            "last_updated": datetime.now().isoformat(sep=" ", timespec="seconds"),
+            "memory_counts": stats["memory_counts"],
+            "layer_distribution": stats["layer_counts"],
+            "wing_distribution": stats["wing_counts"],
+            "palace_structure": stats["palace_stats"],
         }
 
         # Add config data
         if self.entry.data:
             attrs.update(self.entry.data)
 
-        return attrs
-
-    async def async_update(self):
-        """Update sensor state."""
-        self._memory_counts = await self.memory_manager.async_get_memory_counts()
-        self._layer_counts = await self.memory_manager.async_get_layer_counts()
-        self._wing_counts = await self.memory_manager.async_get_wing_counts()
-
-        # Get palace stats
-        try:
-            self._palace_stats = self.memory_manager._palace.get_stats()
-        except Exception:
-            self._palace_stats = {"wings": 0, "rooms": 0}
+        self._attr_extra_state_attributes = attrs
 
     async def async_added_to_hass(self):
         self.async_on_remove(
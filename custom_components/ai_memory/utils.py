@@ -1,6 +1,17 @@
 from datetime import datetime
+from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    import json
 
+    orjson = None
+
+
+# Search results keep returning the same recent memories, so their
+# timestamps repeat across calls
+@lru_cache(maxsize=1024)
 def format_date(iso_string):
     if not iso_string:
         return ""
@@ -9,3 +20,20 @@ def format_date(iso_string):
         return dt.strftime("%Y-%m-%d %H:%M")
     except ValueError:
         return iso_string
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a compact JSON string."""
+        return orjson.dumps(obj).decode()
+
+else:  # pragma: no cover
+    JSONDecodeError = json.JSONDecodeError
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a compact JSON string."""
+        return json.dumps(obj, separators=(",", ":"))
@@ -1,12 +1,35 @@
 """Test the AI Memory config flow."""
+import asyncio
 from unittest.mock import patch, MagicMock, AsyncMock
 
+import aiohttp
+import pytest
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from custom_components.ai_memory.config_flow import _async_fetch_models, _async_pull_model
 from custom_components.ai_memory.constants import DOMAIN
 
+_TAGS_LISTING = {"models": [{"name": "llama2"}]}
+
+
+def _tags_response(mock_get: MagicMock, body=_TAGS_LISTING, status: int = 200) -> MagicMock:
+    """Make a patched ClientSession.get answer /api/tags with a status and JSON body."""
+    response = MagicMock()
+    response.status = status
+    response.json = AsyncMock(return_value=body)
+    mock_get.return_value.__aenter__.return_value = response
+    return response
+
+
+@pytest.fixture
+def mock_tags():
+    """Patch aiohttp GETs so /api/tags lists llama2."""
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        _tags_response(mock_get)
+        yield mock_get
+
 
 async def test_form(hass: HomeAssistant) -> None:
     """Test we get the form."""
@@ -215,3 +238,174 @@ async def test_options_flow_remote(hass: HomeAssistant, mock_config_entry) -> No
     assert mock_config_entry.data["embedding_engine"] == "remote"
     assert mock_config_entry.data["remote_url"] == "http://remote:11434"
     assert mock_config_entry.data["model_name"] == "remote_model"
+
+
+async def test_fetch_models_cached(hass: HomeAssistant, mock_tags) -> None:
+    """Test model listings are cached per remote URL."""
+    assert await _async_fetch_models(hass, "http://localhost:11434") == ["llama2"]
+    assert await _async_fetch_models(hass, "http://localhost:11434") == ["llama2"]
+    assert mock_tags.call_count == 1
+
+    # A different server is fetched separately
+    await _async_fetch_models(hass, "http://other:11434")
+    assert mock_tags.call_count == 2
+
+
+@pytest.mark.parametrize("body", [[{"name": "llama2"}], {"models": "llama2"}])
+async def test_fetch_models_malformed_listing(hass: HomeAssistant, mock_tags, body) -> None:
+    """Test /api/tags bodies without a list of models raise ValueError."""
+    _tags_response(mock_tags, body)
+
+    with pytest.raises(ValueError):
+        await _async_fetch_models(hass, "http://localhost:11434")
+
+
+async def test_fetch_models_skips_malformed_entries(hass: HomeAssistant, mock_tags) -> None:
+    """Test listing entries without a name are skipped."""
+    _tags_response(mock_tags, {"models": [{"name": "llama2"}, {"model": "x"}, "bad"]})
+
+    assert await _async_fetch_models(hass, "http://localhost:11434") == ["llama2"]
+
+
+async def test_remote_config_prefetches_models(hass: HomeAssistant, mock_tags) -> None:
+    """Test models for the default URL are fetched while the URL form is shown."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"max_entries": 500, "embedding_engine": "remote"},
+    )
+    assert result2["step_id"] == "remote_config"
+    await hass.async_block_till_done()
+    assert mock_tags.call_count == 1
+
+    # Submitting the default URL reuses the prefetched listing
+    result3 = await hass.config_entries.flow.async_configure(
+        result2["flow_id"],
+        {"remote_url": "http://127.0.0.1:11434"},
+    )
+    assert result3["step_id"] == "model_selection"
+    assert mock_tags.call_count == 1
+
+
+async def test_prefetch_cancelled_when_flow_is_removed(hass: HomeAssistant, mock_tags) -> None:
+    """Test a model prefetch still running is cancelled when the flow is aborted."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    mock_tags.return_value.__aenter__.side_effect = hang
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"max_entries": 500, "embedding_engine": "remote"},
+    )
+    await asyncio.wait_for(started.wait(), timeout=1)
+
+    hass.config_entries.flow.async_abort(result2["flow_id"])
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_model_pull_timeout(hass: HomeAssistant, mock_tags) -> None:
+    """Test a hung model pull surfaces a timeout error."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"max_entries": 500, "embedding_engine": "remote"},
+    )
+
+    with patch("aiohttp.ClientSession.post", side_effect=asyncio.TimeoutError):
+        result3 = await hass.config_entries.flow.async_configure(
+            result2["flow_id"],
+            {"remote_url": "http://localhost:11434"},
+        )
+        result4 = await hass.config_entries.flow.async_configure(
+            result3["flow_id"],
+            {"model_name": "llama2"},
+        )
+
+    assert result4["type"] == FlowResultType.FORM
+    assert result4["step_id"] == "model_selection"
+    assert result4["errors"] == {"base": "timeout"}
+
+
+async def test_remote_config_unreachable(hass: HomeAssistant, mock_tags) -> None:
+    """Test an unreachable server is rejected on the URL step."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"max_entries": 500, "embedding_engine": "remote"},
+    )
+
+    mock_tags.side_effect = aiohttp.ClientError
+    result3 = await hass.config_entries.flow.async_configure(
+        result2["flow_id"],
+        {"remote_url": "http://unreachable:11434"},
+    )
+
+    assert result3["type"] == FlowResultType.FORM
+    assert result3["step_id"] == "remote_config"
+    assert result3["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.mark.parametrize("status", [404, 500])
+async def test_remote_config_non_ollama_server(hass: HomeAssistant, mock_tags, status) -> None:
+    """Test a server answering /api/tags with an error status is rejected."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"max_entries": 500, "embedding_engine": "remote"},
+    )
+
+    _tags_response(mock_tags, None, status)
+    result3 = await hass.config_entries.flow.async_configure(
+        result2["flow_id"],
+        {"remote_url": "http://not-ollama:8080"},
+    )
+
+    assert result3["type"] == FlowResultType.FORM
+    assert result3["step_id"] == "remote_config"
+    assert result3["errors"] == {"base": "cannot_connect"}
+
+
+async def test_concurrent_pulls_are_deduplicated(hass: HomeAssistant) -> None:
+    """Test simultaneous pulls of the same model share one request."""
+    release = asyncio.Event()
+
+    async def slow_enter(*args, **kwargs):
+        await release.wait()
+        response = MagicMock()
+        response.status = 200
+        return response
+
+    with patch("aiohttp.ClientSession.post") as mock_post:
+        mock_post.return_value.__aenter__.side_effect = slow_enter
+
+        first = asyncio.ensure_future(_async_pull_model(hass, "http://localhost:11434", "llama2"))
+        second = asyncio.ensure_future(_async_pull_model(hass, "http://localhost:11434", "llama2"))
+        await asyncio.sleep(0)
+        # The pull runs as one background task rather than a tracked one
+        pulls = [t for t in asyncio.all_tasks() if t.get_name() == "ai_memory_model_pull"]
+        assert len(pulls) == 1
+        release.set()
+
+        assert await asyncio.gather(first, second) == [True, True]
+        assert mock_post.call_count == 1
@@ -1,4 +1,5 @@
 """Tests for EmbeddingEngine selector."""
+import threading
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
@@ -21,6 +22,12 @@ class TestEmbeddingEngine:
         hass.async_add_executor_job = AsyncMock(side_effect=lambda f, *args: f(*args))
         return hass
 
+    @pytest.fixture(autouse=True)
+    def mock_call_later(self):
+        """Capture scheduled flushes instead of arming real timers."""
+        with patch("custom_components.ai_memory.embedding.engine.async_call_later") as mock:
+            yield mock
+
     def test_init_defaults(self, mock_hass):
         """Test initialization with defaults."""
         engine = EmbeddingEngine(mock_hass)
@@ -134,6 +141,75 @@ class TestEmbeddingEngine:
         with pytest.raises(Exception, match="Generation failed"):
             await engine.async_generate_embedding("test")
 
+    async def test_generate_embedding_cache_hit_skips_executor(self, mock_hass):
+        """Test a repeated text is served from the cache without an executor job."""
+        engine = EmbeddingEngine(mock_hass)
+        engine._engine = MagicMock()
+        engine._engine.generate_embedding.return_value = [0.1, 0.2]
+        engine._initialized = True
+
+        assert await engine.async_generate_embedding("repeat") == [0.1, 0.2]
+        assert await engine.async_generate_embedding("repeat") == [0.1, 0.2]
+
+        assert mock_hass.async_add_executor_job.call_count == 1
+        engine._engine.generate_embedding.assert_called_once_with("repeat")
+
+    def test_embedding_cache_is_lru(self, mock_hass):
+        """Test the least recently used text is evicted first."""
+        engine = EmbeddingEngine(mock_hass)
+        with patch("custom_components.ai_memory.embedding.engine._EMBEDDING_CACHE_MAX", 2):
+            engine._cache_put("a", [1.0])
+            engine._cache_put("b", [2.0])
+            engine._cache_get("a")
+            engine._cache_put("c", [3.0])
+
+        assert list(engine._cache) == ["a", "c"]
+
+    def test_embedding_cache_thread_safe(self, mock_hass):
+        """Test concurrent lookups and evicting inserts never corrupt the LRU."""
+        engine = EmbeddingEngine(mock_hass)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    text = str((i + offset) % 8)
+                    engine._cache_put(text, [float(i)])
+                    engine._cache_get(str((i + offset + 1) % 8))
+            except Exception as e:
+                errors.append(e)
+
+        with patch("custom_components.ai_memory.embedding.engine._EMBEDDING_CACHE_MAX", 4):
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert len(engine._cache) <= 4
+
+    def test_embedding_cache_keyed_on_full_text(self, mock_hass):
+        """Test texts sharing a long prefix do not share an embedding."""
+        engine = EmbeddingEngine(mock_hass)
+        engine._engine = MagicMock()
+        engine._engine.generate_embedding.side_effect = lambda text: [float(len(text))]
+        engine._initialized = True
+
+        prefix = "x" * 300
+        assert engine._generate_embedding_sync(prefix + "a") != engine._generate_embedding_sync(prefix + "ab")
+
+    @patch("custom_components.ai_memory.embedding.engine.EmbeddingEngine._create_engine")
+    def test_initialize_engine_clears_cache(self, mock_create, mock_hass):
+        """Test re-initialization drops embeddings from the previous engine."""
+        mock_create.return_value = MagicMock()
+        engine = EmbeddingEngine(mock_hass)
+        engine._cache_put("stale", [0.5])
+
+        engine._initialize_engine()
+
+        assert not engine._cache
+
     async def test_async_update_vocabulary(self, mock_hass):
         """Test vocabulary update delegation."""
         engine = EmbeddingEngine(mock_hass)
@@ -144,6 +220,39 @@ class TestEmbeddingEngine:
 
         engine._engine.update_vocabulary.assert_called_with("new word")
 
+    async def test_async_update_vocabulary_schedules_one_flush(self, mock_hass, mock_call_later):
+        """Test a burst of updates shares one delayed flush."""
+        engine = EmbeddingEngine(mock_hass)
+        engine._engine = MagicMock()
+        engine._initialized = True
+
+        await engine.async_update_vocabulary("first")
+        await engine.async_update_vocabulary("second")
+
+        mock_call_later.assert_called_once()
+        engine._engine.flush.assert_not_called()
+
+        scheduled = mock_call_later.call_args[0][2]
+        await scheduled(None)
+        engine._engine.flush.assert_called_once()
+
+        # Once flushed, the next update arms a new timer
+        await engine.async_update_vocabulary("third")
+        assert mock_call_later.call_count == 2
+
+        engine.async_cancel_scheduled_flush()
+        mock_call_later.return_value.assert_called_once()
+
+    async def test_async_update_vocabulary_unsupported(self, mock_hass):
+        """Test engines without update_vocabulary skip the executor job."""
+        engine = EmbeddingEngine(mock_hass)
+        engine._engine = MagicMock(spec=["generate_embedding"])
+        engine._initialized = True
+
+        await engine.async_update_vocabulary("new word")
+
+        mock_hass.async_add_executor_job.assert_not_called()
+
     async def test_async_update_vocabulary_not_initialized(self, mock_hass):
         """Test vocabulary update initializes engine."""
         engine = EmbeddingEngine(mock_hass)
@@ -152,6 +261,15 @@ class TestEmbeddingEngine:
             await engine.async_update_vocabulary("test")
             mock_init.assert_called_once()
 
+    async def test_async_update_vocabulary_initializes_in_executor(self, mock_hass):
+        """Test lazy engine creation from a vocabulary update stays off the event loop."""
+        engine = EmbeddingEngine(mock_hass)
+        with patch.object(engine, '_initialize_engine') as mock_init:
+            engine._engine = MagicMock()
+            await engine.async_update_vocabulary("test")
+
+        mock_hass.async_add_executor_job.assert_any_call(mock_init)
+
     @patch("custom_components.ai_memory.embedding.engine.EmbeddingEngine._create_engine")
     async def test_initialize_engine_import_error(self, mock_create, mock_hass):
         """Test engine creation import error."""
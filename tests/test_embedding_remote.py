@@ -1,10 +1,13 @@
 """Tests for Remote embedding engine."""
 from unittest.mock import Mock, patch, AsyncMock
 
+import orjson
 import pytest
 
 from custom_components.ai_memory.embedding.remote import RemoteEmbeddingEngine
 
+_CLIENTSESSION = "custom_components.ai_memory.embedding.remote.async_get_clientsession"
+
 
 class TestRemoteEmbeddingEngine:
     """Test Remote engine."""
@@ -36,10 +39,10 @@ class TestRemoteEmbeddingEngine:
         # Generate a 384-dimensional embedding to match EMBEDDINGS_VECTOR_DIM
         fake_embedding = [0.1] * 384
 
-        with patch("requests.post") as mock_post:
+        with patch.object(engine._session, "post") as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {"embeddings": [fake_embedding]}
+            mock_response.content = orjson.dumps({"embeddings": [fake_embedding]})
             mock_post.return_value = mock_response
 
             embedding = engine.generate_embedding("test")
@@ -54,7 +57,8 @@ class TestRemoteEmbeddingEngine:
     @pytest.mark.asyncio
     async def test_async_get_version_success(self, mock_hass):
         engine = RemoteEmbeddingEngine(mock_hass, {"remote_url": "http://localhost:11434"})
-        with patch("aiohttp.ClientSession.get") as mock_get:
+        with patch(_CLIENTSESSION) as mock_get_session:
+            mock_get = mock_get_session.return_value.get
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_get.return_value.__aenter__.return_value = mock_response
@@ -64,7 +68,8 @@ class TestRemoteEmbeddingEngine:
     @pytest.mark.asyncio
     async def test_async_get_version_failure(self, mock_hass):
         engine = RemoteEmbeddingEngine(mock_hass, {"remote_url": "http://localhost:11434"})
-        with patch("aiohttp.ClientSession.get") as mock_get:
+        with patch(_CLIENTSESSION) as mock_get_session:
+            mock_get = mock_get_session.return_value.get
             mock_get.side_effect = Exception("Connection failed")
             assert await engine.async_get_version() is False
 
@@ -73,7 +78,8 @@ class TestRemoteEmbeddingEngine:
         """Test successful model loading."""
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
 
-        with patch("aiohttp.ClientSession.post") as mock_post:
+        with patch(_CLIENTSESSION) as mock_get_session:
+            mock_post = mock_get_session.return_value.post
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_post.return_value.__aenter__.return_value = mock_response
@@ -92,10 +98,10 @@ class TestRemoteEmbeddingEngine:
 
         fake_embedding = [0.1] * 384
 
-        with patch("requests.post") as mock_post:
+        with patch.object(engine._session, "post") as mock_post:
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {"embeddings": [fake_embedding]}
+            mock_response.content = orjson.dumps({"embeddings": [fake_embedding]})
             mock_post.return_value = mock_response
 
             embedding = engine.generate_embedding("test")
@@ -112,7 +118,8 @@ class TestRemoteEmbeddingEngine:
         """Test model loading failure."""
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
 
-        with patch("aiohttp.ClientSession.post") as mock_post:
+        with patch(_CLIENTSESSION) as mock_get_session:
+            mock_post = mock_get_session.return_value.post
             mock_response = AsyncMock()
             mock_response.status = 500
             mock_response.text.return_value = "Internal Server Error"
@@ -127,7 +134,8 @@ class TestRemoteEmbeddingEngine:
         """Test model loading exception."""
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
 
-        with patch("aiohttp.ClientSession.post", side_effect=Exception("Connection failed")):
+        with patch(_CLIENTSESSION) as mock_get_session:
+            mock_get_session.return_value.post.side_effect = Exception("Connection failed")
             await engine.async_load_model()
             assert engine._model_loaded is False
 
@@ -135,7 +143,7 @@ class TestRemoteEmbeddingEngine:
         """Test sync embedding generation failure."""
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
 
-        with patch("requests.post", side_effect=Exception("Request failed")):
+        with patch.object(engine._session, "post", side_effect=Exception("Request failed")):
             with pytest.raises(RuntimeError, match="Remote embedding failed"):
                 engine.generate_embedding("test")
 
@@ -144,7 +152,7 @@ class TestRemoteEmbeddingEngine:
         """Test async embedding generation failure."""
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
 
-        with patch("aiohttp.ClientSession.post", side_effect=Exception("Request failed")):
+        with patch.object(engine._session, "post", side_effect=Exception("Request failed")):
             with pytest.raises(RuntimeError, match="Remote embedding failed"):
                 engine.generate_embedding("test")
 
@@ -159,3 +167,12 @@ class TestRemoteEmbeddingEngine:
         engine = RemoteEmbeddingEngine(mock_hass, config_data)
         engine.update_vocabulary("test")
         # Should just pass without error
+
+    def test_close_closes_session(self, mock_hass, config_data):
+        """Test close releases the pooled requests session."""
+        engine = RemoteEmbeddingEngine(mock_hass, config_data)
+
+        with patch.object(engine._session, "close") as mock_close:
+            engine.close()
+
+        mock_close.assert_called_once()
@@ -1,10 +1,15 @@
 """Tests for TF-IDF embedding engine."""
+import math
+import os
 import tempfile
-from unittest.mock import Mock
+import zlib
+from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
 from custom_components.ai_memory.embedding.tfidf import TFIDFEmbeddingEngine
+from custom_components.ai_memory.utils import json_dumps
 
 
 @pytest.fixture
@@ -57,16 +62,17 @@ class TestTFIDFEmbeddingEngine:
         assert "example" in tokens
 
     def test_tf_calculation(self, mock_hass):
-        """Test term frequency calculation."""
+        """Test term frequency weighting in the generated vector."""
         engine = TFIDFEmbeddingEngine(mock_hass)
 
-        tokens = ["hello", "world", "hello"]
-        tf = engine._calculate_tf(tokens)
+        # Empty corpus, so every IDF is 1.0 and the vector carries raw TF
+        vector = engine.generate_embedding("hello world hello")
 
-        # "hello" appears twice (max count), so TF = 2/2 = 1.0
-        assert tf["hello"] == 1.0
-        # "world" appears once, so TF = 1/2 = 0.5
-        assert tf["world"] == 0.5
+        # "hello" appears twice (max count), so TF = 2/2 = 1.0;
+        # "world" appears once, so TF = 1/2 = 0.5; then L2-normalized
+        norm = math.sqrt(1.0 ** 2 + 0.5 ** 2)
+        assert vector[engine._hash_term_to_index("hello")] == pytest.approx(1.0 / norm)
+        assert vector[engine._hash_term_to_index("world")] == pytest.approx(0.5 / norm)
 
     def test_idf_calculation(self, mock_hass):
         """Test inverse document frequency calculation."""
@@ -99,20 +105,28 @@ class TestTFIDFEmbeddingEngine:
         # Index should be within bounds
         assert 0 <= idx1 < 384
 
+    def test_term_hashing_stable_across_processes(self, mock_hass):
+        """Test term indices do not depend on the per-process hash() salt."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+
+        assert engine._hash_term_to_index("test") == zlib.crc32(b"test") % 384
+
     def test_vector_creation(self, mock_hass):
         """Test vector creation and normalization."""
         engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
 
-        tf_idf = {"hello": 0.5, "world": 0.3}
-        vector = engine._create_vector(tf_idf)
+        # Buckets 7 and 7 collide and sum; bucket 3 stands alone
+        vector = engine._scatter_normalize(
+            np.array([7, 3, 7], dtype=np.intp), np.array([0.25, 0.3, 0.25])
+        )
 
         # Check dimension
         assert len(vector) == 384
 
         # Check normalization (L2 norm should be ~1)
-        import math
         magnitude = math.sqrt(sum(x * x for x in vector))
         assert abs(magnitude - 1.0) < 0.001
+        assert vector[7] / vector[3] == pytest.approx(0.5 / 0.3)
 
     def test_update_vocabulary(self, mock_hass):
         """Test vocabulary update."""
@@ -146,6 +160,26 @@ class TestTFIDFEmbeddingEngine:
         embedding = engine.generate_embedding("")
         assert embedding == [0.0] * 384
 
+    def test_generate_embedding_tfidf_weights(self, mock_hass):
+        """Test the vector matches TF * IDF worked out by hand."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        engine.update_vocabulary("the kitchen light is on")
+        engine.update_vocabulary("the garage door is open")
+
+        vector = engine.generate_embedding("the kitchen light light")
+
+        # N=2. "the" is in both documents: IDF = log(3/3) = 0.
+        # "kitchen" and "light" are in one: IDF = log(3/2).
+        # TF: light = 2/2 = 1.0, kitchen = 1/2 = 0.5.
+        idf = math.log(3 / 2)
+        light, kitchen = 1.0 * idf, 0.5 * idf
+        norm = math.sqrt(light ** 2 + kitchen ** 2)
+        expected = [0.0] * 384
+        expected[engine._hash_term_to_index("light")] = light / norm
+        expected[engine._hash_term_to_index("kitchen")] = kitchen / norm
+
+        assert vector == pytest.approx(expected)
+
     @pytest.mark.asyncio
     async def test_embedding_generation_async(self, mock_hass):
         """Test asynchronous embedding generation."""
@@ -201,3 +235,120 @@ class TestTFIDFEmbeddingEngine:
         # Check loaded vocabulary
         assert engine2._document_count == engine1._document_count
         assert engine2._term_document_freq == engine1._term_document_freq
+
+    def test_save_vocabulary_creates_storage_dir_once(self, mock_hass):
+        """Test the storage directory is only created on the first save."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+
+        with patch(
+            "custom_components.ai_memory.embedding.tfidf.os.makedirs",
+            wraps=os.makedirs,
+        ) as mock_makedirs:
+            engine.update_vocabulary("hello world")
+            engine._save_vocabulary()
+            engine._save_vocabulary()
+
+        mock_makedirs.assert_called_once()
+
+    def test_save_vocabulary_is_atomic(self, mock_hass):
+        """Test a failed save leaves the previous vocabulary intact."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        engine.update_vocabulary("hello world")
+        engine._save_vocabulary()
+
+        engine.update_vocabulary("another document")
+        with patch(
+            "custom_components.ai_memory.embedding.tfidf.json_dumps",
+            side_effect=OSError("disk full"),
+        ):
+            engine._save_vocabulary()
+
+        reloaded = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        assert reloaded._document_count == 1
+
+    def test_update_vocabulary_saves_on_flush(self, mock_hass):
+        """Test updates stay in memory until flush() writes them once."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+
+        with patch.object(engine, "_save_vocabulary", wraps=engine._save_vocabulary) as mock_save:
+            for i in range(25):
+                engine.update_vocabulary(f"document number {i}")
+            mock_save.assert_not_called()
+
+            engine.flush()
+            assert mock_save.call_count == 1
+
+            # Nothing changed since, so a second flush is a no-op
+            engine.flush()
+            assert mock_save.call_count == 1
+
+        reloaded = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        assert reloaded._document_count == 25
+
+    def test_update_during_save_stays_dirty(self, mock_hass):
+        """Test an update landing while the file is written is saved next time."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        engine.update_vocabulary("hello world")
+        real_dumps = json_dumps
+
+        def dumps_with_update(data):
+            engine.update_vocabulary("late document")
+            return real_dumps(data)
+
+        with patch(
+            "custom_components.ai_memory.embedding.tfidf.json_dumps",
+            side_effect=dumps_with_update,
+        ):
+            engine.flush()
+
+        assert TFIDFEmbeddingEngine(mock_hass, vector_dim=384)._document_count == 1
+        assert engine._dirty
+
+        engine.flush()
+        assert TFIDFEmbeddingEngine(mock_hass, vector_dim=384)._document_count == 2
+
+    def test_failed_save_stays_dirty(self, mock_hass):
+        """Test a failed save leaves the vocabulary marked for the next flush."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        engine.update_vocabulary("hello world")
+
+        with patch(
+            "custom_components.ai_memory.embedding.tfidf.os.replace",
+            side_effect=OSError("disk full"),
+        ):
+            engine.flush()
+
+        assert engine._dirty
+
+    def test_vocabulary_is_pruned_when_too_large(self, mock_hass):
+        """Test single-document terms are dropped once the vocabulary cap is hit."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+
+        with patch("custom_components.ai_memory.embedding.tfidf._VOCAB_MAX_TERMS", 5), \
+                patch("custom_components.ai_memory.embedding.tfidf._VOCAB_PRUNE_TARGET", 4):
+            engine.update_vocabulary("shared alpha")
+            engine.update_vocabulary("shared beta")
+            engine.update_vocabulary("shared gamma delta epsilon")
+
+        assert dict(engine._term_document_freq) == {"shared": 3}
+        assert engine._document_count == 3
+        # Pruned one-document terms keep the IDF of a one-document term
+        assert engine._df_floor == 1
+        assert engine._calculate_idf("alpha") == pytest.approx(math.log(4 / 2))
+
+    def test_prune_keeps_floor_for_dropped_frequent_terms(self, mock_hass):
+        """Test terms dropped by the top-N pass keep the highest dropped frequency."""
+        engine = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        engine._document_count = 10
+        engine._term_document_freq.update({"a": 9, "b": 7, "c": 3, "d": 2, "e": 1})
+
+        with patch("custom_components.ai_memory.embedding.tfidf._VOCAB_PRUNE_TARGET", 2):
+            engine._prune_vocabulary()
+
+        assert dict(engine._term_document_freq) == {"a": 9, "b": 7}
+        assert engine._df_floor == 3
+        assert engine._calculate_idf("c") == pytest.approx(math.log(11 / 4))
+
+        engine._save_vocabulary()
+        reloaded = TFIDFEmbeddingEngine(mock_hass, vector_dim=384)
+        assert reloaded._df_floor == 3
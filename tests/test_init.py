@@ -1,6 +1,7 @@
 """Tests for AI Memory Init."""
 from unittest.mock import patch, MagicMock, AsyncMock
 
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
 
 from custom_components.ai_memory import (
@@ -16,22 +17,27 @@ async def test_async_setup(hass: HomeAssistant):
     """Test async_setup."""
     assert await async_setup(hass, {})
     assert DOMAIN in hass.data
+    assert hass.services.has_service(DOMAIN, "add_memory")
+    assert hass.services.has_service(DOMAIN, "list_memories")
+    assert hass.services.has_service(DOMAIN, "search_memory")
+    assert hass.services.has_service(DOMAIN, "delete_memory")
+
+    # A second setup must not re-register services
+    with patch("custom_components.ai_memory._register_services") as mock_register:
+        assert await async_setup(hass, {})
+        mock_register.assert_not_called()
 
 
 async def test_setup_entry_creates_single_manager(hass: HomeAssistant, mock_config_entry):
     """Test that setup creates a single memory manager."""
     mock_config_entry.add_to_hass(hass)
 
-    # Mock dependencies
-    mock_memory_api = MagicMock()
-    mock_memory_api.async_setup = AsyncMock()
-
     import custom_components.ai_memory
     with patch.object(custom_components.ai_memory, "MemoryManager") as mock_manager_cls, \
             patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"), \
-            patch.dict("sys.modules", {
-                "custom_components.ai_memory.memory_llm_api": mock_memory_api
-            }):
+            patch.object(
+                custom_components.ai_memory.llm_api, "async_setup", AsyncMock()
+            ) as mock_api_setup:
         mock_instance = mock_manager_cls.return_value
         mock_instance.async_initialize = AsyncMock()
 
@@ -40,6 +46,29 @@ async def test_setup_entry_creates_single_manager(hass: HomeAssistant, mock_conf
         # Verify single manager created and stored
         assert "manager" in hass.data[DOMAIN]
         assert hass.data[DOMAIN]["manager"] == mock_instance
+        mock_manager_cls.assert_called_once_with(
+            hass, "tfidf", 500, config_data=mock_config_entry.data
+        )
+        mock_api_setup.assert_awaited_once_with(hass)
+
+
+async def test_setup_entry_flushes_on_stop(hass: HomeAssistant, mock_config_entry):
+    """Test pending embedding state is saved when Home Assistant stops."""
+    mock_config_entry.add_to_hass(hass)
+
+    import custom_components.ai_memory
+    with patch.object(custom_components.ai_memory, "MemoryManager") as mock_manager_cls, \
+            patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"), \
+            patch.object(custom_components.ai_memory.llm_api, "async_setup", AsyncMock()):
+        mock_instance = mock_manager_cls.return_value
+        mock_instance.async_initialize = AsyncMock()
+        assert await async_setup_entry(hass, mock_config_entry)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    mock_instance.async_cancel_scheduled_flush.assert_called_once()
+    mock_instance.flush.assert_called_once()
 
 
 async def test_setup_entry_already_initialized(hass: HomeAssistant, mock_config_entry):
@@ -85,3 +114,27 @@ async def test_reload_entry(hass: HomeAssistant, mock_config_entry):
     with patch("homeassistant.config_entries.ConfigEntries.async_reload", new_callable=AsyncMock) as mock_reload:
         await async_reload_entry(hass, mock_config_entry)
         mock_reload.assert_called_once_with(mock_config_entry.entry_id)
+
+
+async def test_service_handler_resolves_manager_from_call(hass: HomeAssistant):
+    """Test service handlers look up the manager through call.hass."""
+    from custom_components.ai_memory import _async_handle_add_memory
+
+    mock_manager = MagicMock()
+    mock_manager.async_add_memory = AsyncMock()
+    hass.data[DOMAIN] = {"manager": mock_manager}
+
+    call = MagicMock()
+    call.hass = hass
+    call.data = {"text": "Remember this", "room": "notes"}
+
+    assert await _async_handle_add_memory(call) == {"success": True}
+    mock_manager.async_add_memory.assert_awaited_once_with(
+        "Remember this", "common", room="notes", wing=None
+    )
+
+    hass.data[DOMAIN] = {}
+    assert "error" in await _async_handle_add_memory(call)
+
+    hass.data.pop(DOMAIN)
+    assert "error" in await _async_handle_add_memory(call)
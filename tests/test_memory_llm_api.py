@@ -198,6 +198,26 @@ async def test_get_api_instance_success(mock_manager):
     assert len(instance.tools) == 3  # add, search, delete
 
 
+async def test_get_api_instance_reuses_tools(mock_manager):
+    """Test tools are built once per manager and reused across instances."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.data = {DOMAIN: {"manager": mock_manager}}
+
+    api = llm_api.MemoryAPI(hass)
+    llm_context = MockLLMContext("agent_1")
+
+    first = await api.async_get_api_instance(llm_context)
+    second = await api.async_get_api_instance(llm_context)
+    assert all(a is b for a, b in zip(first.tools, second.tools))
+
+    # A new manager (e.g. after reload) gets fresh tools
+    new_manager = MagicMock()
+    hass.data[DOMAIN]["manager"] = new_manager
+    third = await api.async_get_api_instance(llm_context)
+    assert third.tools[0] is not first.tools[0]
+    assert third.tools[0].memory_manager is new_manager
+
+
 async def test_get_api_instance_no_manager():
     """Test getting API instance when manager is missing."""
     hass = MagicMock(spec=HomeAssistant)
@@ -216,8 +236,21 @@ async def test_get_api_instance_no_manager():
 async def test_async_setup_duplicate_registration():
     """Test that duplicate registration is handled gracefully."""
     hass = MagicMock(spec=HomeAssistant)
+    hass.data = {}
 
     with patch.object(llm_api, "llm") as mock_llm_module:
         mock_llm_module.async_register_api.side_effect = Exception("API already registered")
         await llm_api.async_setup(hass)
         mock_llm_module.async_register_api.assert_called_once()
+
+
+async def test_async_setup_registers_once():
+    """Test the API is registered only once across entry reloads."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.data = {}
+
+    with patch.object(llm_api, "llm") as mock_llm_module:
+        await llm_api.async_setup(hass)
+        await llm_api.async_setup(hass)
+        mock_llm_module.async_register_api.assert_called_once()
+        assert hass.data[DOMAIN]["llm_api_registered"] is True
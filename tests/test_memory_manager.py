@@ -1,4 +1,5 @@
 """Tests for Memory Manager with SQLite."""
+import asyncio
 import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch, AsyncMock
@@ -123,12 +124,197 @@ async def test_async_get_memory_counts(memory_manager):
     await memory_manager.async_add_memory("Private 1", "private", "agent_1")
     await memory_manager.async_add_memory("Private 2", "private", "agent_1")
 
-    counts = await memory_manager.async_get_memory_counts()
+    counts = (await memory_manager.async_get_stats())["memory_counts"]
     assert counts["common"] == 1
     assert counts["private"] == 2
     assert counts["total"] == 3
 
 
+async def test_add_memory_evicts_oldest_when_full(mock_hass, mock_embedding_engine):
+    """Test the oldest memory is evicted once max_entries is reached."""
+    with patch("custom_components.ai_memory.memory.manager.EmbeddingEngine") as mock_engine_cls:
+        mock_engine_cls.return_value = mock_embedding_engine
+        manager = MemoryManager(mock_hass, max_entries=2, db_path=":memory:")
+
+    await manager.async_add_memory("First", "common")
+    await manager.async_add_memory("Second", "common")
+    await manager.async_add_memory("Third", "common")
+
+    rows = manager._store.execute_query("SELECT content FROM memories ORDER BY created_at")
+    assert [row[0] for row in rows] == ["Second", "Third"]
+
+
+async def test_add_memory_burst_coalesces_writes(memory_manager):
+    """Test adds landing during an in-flight write share the next transaction."""
+    manager = memory_manager
+    run_job = manager.hass.async_add_executor_job.side_effect
+    release = asyncio.Event()
+    batches = []
+
+    async def gated_executor_job(target, *args):
+        if target == manager._write_memories:
+            batches.append(len(args[0]))
+            await release.wait()
+        return await run_job(target, *args)
+
+    manager.hass.async_add_executor_job.side_effect = gated_executor_job
+
+    first = asyncio.ensure_future(manager.async_add_memory("First", "common"))
+    await asyncio.sleep(0)
+    rest = [
+        asyncio.ensure_future(manager.async_add_memory(text, "common"))
+        for text in ("Second", "Third")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, *rest)
+
+    assert batches == [1, 2]
+    rows = manager._store.execute_query("SELECT content FROM memories")
+    assert sorted(row[0] for row in rows) == ["First", "Second", "Third"]
+
+
+async def test_add_memory_cancelled_writer_does_not_strand_queue(memory_manager):
+    """Test cancelling the writer holding the lock still commits queued rows."""
+    manager = memory_manager
+    run_job = manager.hass.async_add_executor_job.side_effect
+    release = asyncio.Event()
+    batches = []
+
+    async def gated_executor_job(target, *args):
+        if target == manager._write_memories:
+            batches.append(len(args[0]))
+            await release.wait()
+        return await run_job(target, *args)
+
+    manager.hass.async_add_executor_job.side_effect = gated_executor_job
+
+    first = asyncio.ensure_future(manager.async_add_memory("First", "common"))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(manager.async_add_memory("Second", "common"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.wait_for(second, timeout=1)
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert batches == [1, 1]
+    rows = manager._store.execute_query("SELECT content FROM memories")
+    assert sorted(row[0] for row in rows) == ["First", "Second"]
+
+
+async def test_add_memory_cancelled_while_queued_is_dropped(memory_manager):
+    """Test a writer cancelled while waiting for the lock takes its row out of the queue."""
+    manager = memory_manager
+    run_job = manager.hass.async_add_executor_job.side_effect
+    release = asyncio.Event()
+    batches = []
+
+    async def gated_executor_job(target, *args):
+        if target == manager._write_memories:
+            batches.append(len(args[0]))
+            await release.wait()
+        return await run_job(target, *args)
+
+    manager.hass.async_add_executor_job.side_effect = gated_executor_job
+
+    first = asyncio.ensure_future(manager.async_add_memory("First", "common"))
+    while not batches:
+        await asyncio.sleep(0)
+    second = asyncio.ensure_future(manager.async_add_memory("Second", "common"))
+    while not manager._pending_writes:
+        await asyncio.sleep(0)
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert manager._pending_writes == []
+
+    third = asyncio.ensure_future(manager.async_add_memory("Third", "common"))
+    release.set()
+    await asyncio.wait_for(asyncio.gather(first, third), timeout=1)
+
+    assert batches == [1, 1]
+    rows = manager._store.execute_query("SELECT content FROM memories")
+    assert sorted(row[0] for row in rows) == ["First", "Third"]
+
+
+async def test_add_memory_write_error_propagates(memory_manager):
+    """Test a failed commit is raised to the caller that queued the row."""
+    with patch.object(
+        memory_manager._store, "execute_transaction", side_effect=RuntimeError("disk full")
+    ):
+        with pytest.raises(RuntimeError):
+            await memory_manager.async_add_memory("Lost", "common")
+
+    assert memory_manager._pending_writes == []
+
+
+async def test_async_get_stats(memory_manager):
+    """Test all sensor statistics are collected in one executor job."""
+    await memory_manager.async_add_memory("Common 1", "common")
+    await memory_manager.async_add_memory("Private 1", "private", "agent_1")
+    memory_manager.hass.async_add_executor_job.reset_mock()
+
+    stats = await memory_manager.async_get_stats()
+
+    assert memory_manager.hass.async_add_executor_job.await_count == 1
+    assert stats["memory_counts"] == {"common": 1, "private": 1, "total": 2}
+    assert stats["layer_counts"]["L2"] == 2
+    assert sum(stats["wing_counts"].values()) == 2
+    assert stats["palace_stats"]["rooms"] > 0
+
+
+async def test_async_get_memories_cached_until_write(memory_manager):
+    """Test list results are served from cache until the next add/delete."""
+    await memory_manager.async_add_memory("First", "common")
+
+    first = await memory_manager.async_get_memories(limit=10)
+    memory_manager.hass.async_add_executor_job.reset_mock()
+    second = await memory_manager.async_get_memories(limit=10)
+
+    assert second == first
+    memory_manager.hass.async_add_executor_job.assert_not_awaited()
+
+    await memory_manager.async_add_memory("Second", "common")
+    third = await memory_manager.async_get_memories(limit=10)
+    assert len(third) == 2
+
+
+async def test_async_get_memories_returns_copies(memory_manager):
+    """Test mutating a returned memory does not change later cached results."""
+    await memory_manager.async_add_memory("First", "common")
+
+    first = await memory_manager.async_get_memories(limit=10)
+    first[0]["content"] = "Changed"
+    first.clear()
+
+    second = await memory_manager.async_get_memories(limit=10)
+    second[0]["content"] = "Changed again"
+
+    third = await memory_manager.async_get_memories(limit=10)
+    assert [m["content"] for m in third] == ["First"]
+
+
+async def test_async_get_memories_sees_row_during_vocabulary_update(memory_manager, mock_embedding_engine):
+    """Test the list cache is invalidated as soon as the row is committed."""
+    await memory_manager.async_get_memories(limit=10)
+    seen = []
+
+    async def list_during_update(_text):
+        seen.extend(await memory_manager.async_get_memories(limit=10))
+        raise RuntimeError("vocabulary unavailable")
+
+    mock_embedding_engine.async_update_vocabulary = AsyncMock(side_effect=list_during_update)
+    await memory_manager.async_add_memory("Fresh", "common")
+
+    assert [m["content"] for m in seen] == ["Fresh"]
+    assert len(await memory_manager.async_get_memories(limit=10)) == 1
+
+
 async def test_async_search_memory(memory_manager):
     """Test search returns matching memories."""
     await memory_manager.async_add_memory("Kitchen light is on", "common")
@@ -166,15 +352,20 @@ async def test_add_memory_embedding_failure(memory_manager, mock_embedding_engin
     assert rows[0][0] is None
 
 
-async def test_cosine_similarity_edge_cases():
-    """Test cosine similarity edge cases."""
-    search = MemorySearch.__new__(MemorySearch)
+async def test_score_rows_edge_cases():
+    """Test cosine scoring edge cases."""
+    def score(query, embedding):
+        return MemorySearch._score_rows(
+            np.array(query, dtype=np.float32), [("id", None, json.dumps(embedding))]
+        )
+
     # Zero vectors
-    assert search._cosine_similarity(np.array([0, 0]), np.array([0, 0])) == 0.0
+    assert score([0, 0], [0, 0]) == []
+    assert score([1, 0], [0, 0])[0][1] == 0.0
     # Mismatched length
-    assert search._cosine_similarity(np.array([1]), np.array([1, 2])) == 0.0
+    assert score([1], [1, 2]) == []
     # Empty
-    assert search._cosine_similarity(np.array([]), np.array([])) == 0.0
+    assert score([], []) == []
 
 
 async def test_async_delete_memory_own_private(memory_manager):
@@ -217,6 +408,25 @@ async def test_close(memory_manager):
     assert memory_manager._store._conn is None
 
 
+async def test_async_initialize_pulls_model_in_background(mock_hass, mock_embedding_engine):
+    """Test the remote model pull is scheduled without blocking initialization."""
+    mock_embedding_engine.async_initialize = AsyncMock()
+    mock_embedding_engine._engine = AsyncMock()
+    mock_embedding_engine._engine.async_get_version.return_value = True
+
+    with patch("custom_components.ai_memory.memory.manager.EmbeddingEngine") as mock_engine_cls:
+        mock_engine_cls.return_value = mock_embedding_engine
+        manager = MemoryManager(mock_hass, db_path=":memory:")
+        manager._embedding_engine = mock_embedding_engine
+
+        await manager.async_initialize()
+
+    mock_hass.async_create_background_task.assert_called_once()
+    assert mock_hass.async_create_background_task.call_args[0][1] == "ai_memory_model_pull"
+    # Close the scheduled coroutine; the mocked hass never runs it
+    mock_hass.async_create_background_task.call_args[0][0].close()
+
+
 async def test_async_initialize_failure(mock_hass, mock_embedding_engine):
     """Test initialization failure when remote is down."""
     mock_embedding_engine.async_initialize = AsyncMock()
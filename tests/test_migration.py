@@ -19,7 +19,7 @@ def test_fresh_install(store):
 
     # Check _meta table
     rows = store.execute_query("SELECT value FROM _meta WHERE key = 'db_version'")
-    assert rows[0][0] == "1"
+    assert rows[0][0] == "2"
 
     # Check memories table columns
     columns = [row[1] for row in store.execute_query("PRAGMA table_info(memories)")]
@@ -43,9 +43,9 @@ def test_migration_idempotent(store):
     mgr.migrate()
     mgr.migrate()  # Should not raise
 
-    # Version should still be 1
+    # Version should still be 2
     rows = store.execute_query("SELECT value FROM _meta WHERE key = 'db_version'")
-    assert rows[0][0] == "1"
+    assert rows[0][0] == "2"
 
 
 def test_v0_to_v1_upgrade(store):
@@ -102,4 +102,24 @@ def test_indexes_created(store):
     assert "idx_memories_wing_room" in index_names
     assert "idx_memories_layer" in index_names
     assert "idx_memories_scope_agent" in index_names
+    assert "idx_memories_created_at" in index_names
     assert "idx_kg_subject" in index_names
+
+
+def test_v1_to_v2_upgrade(store):
+    """Test upgrade from v1 adds the created_at index."""
+    mgr = MigrationManager(store)
+    mgr._ensure_meta_table()
+    store.execute_commit(
+        "CREATE TABLE memories (id TEXT PRIMARY KEY, content TEXT, created_at TEXT)"
+    )
+    mgr._set_version(1)
+
+    mgr.migrate()
+
+    rows = store.execute_query("SELECT value FROM _meta WHERE key = 'db_version'")
+    assert rows[0][0] == "2"
+    rows = store.execute_query(
+        "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_memories_created_at'"
+    )
+    assert len(rows) == 1
@@ -1,5 +1,6 @@
 """Tests for Palace structure and Room detection."""
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -102,6 +103,10 @@ def test_get_all_keywords(palace):
     # 'light' should map to devices room
     assert "light" in keyword_map
     assert keyword_map["light"]["room"] == "devices"
+    # Keywords of the same room share one read-only mapping
+    assert keyword_map["light"] is keyword_map["switch"]
+    with pytest.raises(TypeError):
+        keyword_map["light"]["room"] = "other"
 
 
 def test_get_stats(palace):
@@ -147,6 +152,27 @@ def test_validate_existing_room_no_duplicate(store, palace):
     assert initial == after
 
 
+def test_validate_known_room_skips_lookup(store, palace):
+    """Test a room seen once is not looked up again."""
+    palace.validate_or_create_room("household", "devices", "common")
+
+    with patch.object(store, "execute_query", wraps=store.execute_query) as mock_query:
+        palace.validate_or_create_room("Household", "Devices", "common")
+        mock_query.assert_not_called()
+
+
+def test_validate_recreates_removed_room(store, palace):
+    """Test a removed room is recreated rather than served from cache."""
+    palace.validate_or_create_room("general", "temp_room", "common")
+    palace.remove_room("general", "temp_room")
+    palace.validate_or_create_room("general", "temp_room", "common")
+
+    rows = store.execute_query(
+        "SELECT COUNT(*) FROM palace_structure WHERE wing='general' AND room='temp_room'"
+    )
+    assert rows[0][0] == 1
+
+
 # --- RoomDetector Tests ---
 
 def test_detect_keyword_match(store, palace):
@@ -169,14 +169,35 @@ async def test_text_fallback_no_match(search, store, mock_hass, mock_embedding_e
     assert results == []
 
 
-async def test_cosine_similarity():
+async def test_score_rows_cosine_similarity():
     """Test cosine similarity calculation."""
-    s = MemorySearch.__new__(MemorySearch)
+    def score(query, embedding):
+        rows = [("id", None, json.dumps(embedding))]
+        return MemorySearch._score_rows(np.array(query, dtype=np.float32), rows)[0][1]
+
     # Identical vectors
-    assert s._cosine_similarity(np.array([1, 0]), np.array([1, 0])) == pytest.approx(1.0)
+    assert score([1, 0], [1, 0]) == pytest.approx(1.0)
     # Orthogonal vectors
-    assert s._cosine_similarity(np.array([1, 0]), np.array([0, 1])) == pytest.approx(0.0)
+    assert score([1, 0], [0, 1]) == pytest.approx(0.0)
     # Opposite vectors
-    assert s._cosine_similarity(np.array([1, 0]), np.array([-1, 0])) == pytest.approx(-1.0)
+    assert score([1, 0], [-1, 0]) == pytest.approx(-1.0)
     # Zero vectors
-    assert s._cosine_similarity(np.array([0, 0]), np.array([1, 0])) == 0.0
+    assert score([1, 0], [0, 0]) == 0.0
+
+
+async def test_score_rows_batch():
+    """Test batched scoring agrees with per-row cosine similarity."""
+    query_vec = np.array([1.0, 2.0, 0.5], dtype=np.float32)
+    vectors = [[1.0, 0.0, 0.0], [0.3, -1.0, 2.0], [0.0, 0.0, 0.0]]
+    rows = [("id%d" % i, None, json.dumps(v)) for i, v in enumerate(vectors)]
+    # Missing, dimension-mismatched and corrupt embeddings are skipped
+    rows += [("none", None, None), ("short", None, "[1.0, 2.0]"), ("bad", None, "{")]
+
+    scored = MemorySearch._score_rows(query_vec, rows)
+
+    assert [row[0] for row, _ in scored] == ["id0", "id1", "id2"]
+    query_norm = np.linalg.norm(query_vec)
+    for (row, score), vector in zip(scored, vectors):
+        vector_norm = np.linalg.norm(vector)
+        expected = np.dot(query_vec, vector) / (query_norm * vector_norm) if vector_norm else 0.0
+        assert score == pytest.approx(expected, abs=1e-6)
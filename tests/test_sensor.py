@@ -15,11 +15,12 @@ async def test_sensor_creation(hass: HomeAssistant, mock_config_entry):
     mock_manager = MagicMock()
     mock_manager._max_entries = 100
     mock_manager._embedding_engine.engine_name = "test_engine"
-    mock_manager.async_get_memory_counts = AsyncMock(return_value={"total": 10})
-    mock_manager.async_get_layer_counts = AsyncMock(return_value={"L1": 2, "L2": 8})
-    mock_manager.async_get_wing_counts = AsyncMock(return_value={"household": 5, "personal": 5})
-    mock_manager._palace = MagicMock()
-    mock_manager._palace.get_stats.return_value = {"wings": 3, "rooms": 8}
+    mock_manager.async_get_stats = AsyncMock(return_value={
+        "memory_counts": {"total": 10},
+        "layer_counts": {"L1": 2, "L2": 8},
+        "wing_counts": {"household": 5, "personal": 5},
+        "palace_stats": {"wings": 3, "rooms": 8},
+    })
 
     hass.data[DOMAIN] = {"manager": mock_manager}
 
@@ -39,6 +40,7 @@ async def test_sensor_creation(hass: HomeAssistant, mock_config_entry):
     assert sensor.extra_state_attributes["layer_distribution"] == {"L1": 2, "L2": 8}
     assert sensor.extra_state_attributes["wing_distribution"] == {"household": 5, "personal": 5}
     assert sensor.extra_state_attributes["palace_structure"] == {"wings": 3, "rooms": 8}
+    mock_manager.async_get_stats.assert_awaited_once()
     assert sensor.extra_state_attributes["max_entries"] == 500
 
     # Verify scan interval can be set
@@ -90,6 +90,34 @@ def test_execute_commit_many_empty(store):
     store.execute_commit_many("SELECT 1", [])  # Should not raise
 
 
+def test_execute_transaction(store):
+    """Test several statements commit together."""
+    store.execute_commit("CREATE TABLE test (id INTEGER PRIMARY KEY, val TEXT)")
+    store.execute_commit("INSERT INTO test VALUES (1, 'a')")
+    store.execute_transaction([
+        ("DELETE FROM test WHERE id = ?", (1,)),
+        ("INSERT INTO test VALUES (?, ?)", (2, "b")),
+    ])
+
+    rows = store.execute_query("SELECT id, val FROM test")
+    assert rows == [(2, "b")]
+
+
+def test_execute_transaction_rollback_on_error(store):
+    """Test a failing statement rolls back the whole transaction."""
+    store.execute_commit("CREATE TABLE test (id INTEGER PRIMARY KEY, val TEXT NOT NULL)")
+    store.execute_commit("INSERT INTO test VALUES (1, 'a')")
+
+    with pytest.raises(Exception):
+        store.execute_transaction([
+            ("DELETE FROM test WHERE id = ?", (1,)),
+            ("INSERT INTO test VALUES (?, ?)", (2, None)),
+        ])
+
+    rows = store.execute_query("SELECT id FROM test")
+    assert rows == [(1,)]
+
+
 def test_validate_embedding_valid():
     """Test valid embedding is serialized to JSON."""
     import json